@@ -0,0 +1,41 @@
+"""Benchmarks for `bulkdata.field` module.
+
+Run from the repository root with ``python -m benchmarks.bench_field``.
+"""
+
+import timeit
+
+from bulkdata.card import Card
+from bulkdata.deck import Deck
+from bulkdata.field import Field, read_field
+
+
+def bench_field_value(number=1000000):
+    field = Field(1.234)
+    seconds = timeit.timeit(lambda: field.value, number=number)
+    print("Field.value read x {}: {:.3f} s".format(number, seconds))
+
+
+def bench_read_field(number=200000):
+    for raw in ("12345", "1.2345", "-1.5-3", "GRID", ""):
+        seconds = timeit.timeit(lambda: read_field(raw), number=number)
+        print("read_field({!r}) x {}: {:.3f} s".format(raw, number, seconds))
+
+
+def bench_deck_find_fields(numcards=100000, numqueries=10):
+    cards = []
+    for i in range(numcards):
+        card = Card("GRID")
+        card.extend([i + 1, None, 1., 2., 3.])
+        cards.append(card)
+    deck = Deck(cards)
+    filter_ = {"name": "GRID", "fields": {"index": 2, "value": 1.5}}
+    seconds = timeit.timeit(lambda: deck.find_one(filter_), number=numqueries)
+    print("Deck.find_one by field on {} cards x {}: {:.3f} s"
+          .format(numcards, numqueries, seconds))
+
+
+if __name__ == "__main__":
+    bench_field_value()
+    bench_read_field()
+    bench_deck_find_fields()
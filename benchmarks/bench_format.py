@@ -0,0 +1,30 @@
+"""Benchmarks for `bulkdata.format` module.
+
+Run from the repository root with ``python -m benchmarks.bench_format``.
+"""
+
+import timeit
+
+from bulkdata.card import Card
+from bulkdata.format import format_card
+
+
+def make_card(name, numfields):
+    card = Card(name)
+    card.extend(range(1, numfields + 1))
+    return card
+
+
+def bench_format_card(name, numfields, number):
+    card = make_card(name, numfields)
+    for format in ("fixed", "free"):
+        seconds = min(timeit.repeat(lambda: format_card(card, format),
+                                    number=number, repeat=3))
+        print("format {} card, {} fields, {} x {}: {:.3f} s"
+              .format(format, numfields, name, number, seconds))
+
+
+if __name__ == "__main__":
+    bench_format_card("GRID", 7, 100000)
+    bench_format_card("RBE3", 60, 10000)
+    bench_format_card("SET1", 10000, 20)
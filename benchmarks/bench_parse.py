@@ -0,0 +1,35 @@
+"""Benchmarks for `bulkdata.parse` module.
+
+Run from the repository root with ``python -m benchmarks.bench_parse``.
+"""
+
+import random
+import timeit
+
+from bulkdata.parse import BDFParser
+
+
+def make_deck_str(numlines, comment_ratio, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    for i in range(numlines):
+        if rng.random() < comment_ratio:
+            lines.append("$ comment {}".format(i))
+        else:
+            lines.append("GRID    {:<8d}        1.      2.      3.".format(i))
+    return "\n".join(lines)
+
+
+def bench_remove_comments(numlines=1000000, comment_ratio=0.3, number=3):
+    deck_str = make_deck_str(numlines, comment_ratio)
+    for keep_comments in (False, True):
+        seconds = min(timeit.repeat(
+            lambda: BDFParser(deck_str, keep_comments=keep_comments).parse(),
+            number=1, repeat=number
+        ))
+        print("parse {} lines, {:.0%} comments, keep_comments={}: {:.3f} s"
+              .format(numlines, comment_ratio, keep_comments, seconds))
+
+
+if __name__ == "__main__":
+    bench_remove_comments()
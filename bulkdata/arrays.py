@@ -0,0 +1,332 @@
+"""The :mod:`~bulkdata.arrays` module converts the fields of
+homogeneous cards to and from columns of NumPy arrays.
+"""
+
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+from .card import Card
+from .field import SplitField, read_field, write_field
+from .pyNastran.bdf.field_writer_8 import print_float_8_array
+from .pyNastran.bdf.field_writer_16 import print_float_16_array
+
+
+# kinds of field values, see read_fields_array
+STRING = 0
+INTEGER = 1
+REAL = 2
+
+# character classes of the number scanner
+_PAD, _SPACE, _ZERO, _NONZERO, _SIGN, _DOT, _EXP, _OTHER = range(8)
+
+_CHAR_CLASSES = np.full(128, _OTHER, dtype=np.int8)
+_WHITESPACE = "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f "
+_CHAR_CLASSES[[ord(char) for char in _WHITESPACE]] = _SPACE
+_CHAR_CLASSES[ord("0")] = _ZERO
+_CHAR_CLASSES[[ord(char) for char in "123456789"]] = _NONZERO
+_CHAR_CLASSES[[ord(char) for char in "+-"]] = _SIGN
+_CHAR_CLASSES[ord(".")] = _DOT
+_CHAR_CLASSES[[ord(char) for char in "Ee"]] = _EXP
+
+# states of the number scanner, which accepts the same numbers as
+# bulkdata.field.read_field, surrounded by blanks
+(_START, _SIGNED, _INT, _ZEROINT, _LEADZERO, _POINT, _FRAC, _EXPMARK,
+ _EXPSIGN, _EXPDIGITS, _TRAILINT, _TRAILREAL, _FAIL) = range(13)
+
+_TRANSITIONS = np.full((13, 8), _FAIL, dtype=np.int8)
+_TRANSITIONS[:, _PAD] = np.arange(13)
+_TRANSITIONS[_START, [_SPACE, _ZERO, _NONZERO, _SIGN, _DOT]] = [
+    _START, _ZEROINT, _INT, _SIGNED, _POINT]
+_TRANSITIONS[_SIGNED, [_ZERO, _NONZERO, _DOT]] = [_ZEROINT, _INT, _POINT]
+_TRANSITIONS[_INT, [_SPACE, _ZERO, _NONZERO, _SIGN, _DOT, _EXP]] = [
+    _TRAILINT, _INT, _INT, _EXPSIGN, _FRAC, _EXPMARK]
+_TRANSITIONS[_ZEROINT, [_SPACE, _ZERO, _NONZERO, _SIGN, _DOT, _EXP]] = [
+    _TRAILINT, _LEADZERO, _LEADZERO, _EXPSIGN, _FRAC, _EXPMARK]
+_TRANSITIONS[_LEADZERO, [_SPACE, _ZERO, _NONZERO, _SIGN, _DOT, _EXP]] = [
+    _TRAILREAL, _LEADZERO, _LEADZERO, _EXPSIGN, _FRAC, _EXPMARK]
+_TRANSITIONS[_POINT, [_ZERO, _NONZERO]] = _FRAC
+_TRANSITIONS[_FRAC, [_SPACE, _ZERO, _NONZERO, _SIGN, _EXP]] = [
+    _TRAILREAL, _FRAC, _FRAC, _EXPSIGN, _EXPMARK]
+_TRANSITIONS[_EXPMARK, [_ZERO, _NONZERO, _SIGN]] = [
+    _EXPDIGITS, _EXPDIGITS, _EXPSIGN]
+_TRANSITIONS[_EXPSIGN, [_ZERO, _NONZERO]] = _EXPDIGITS
+_TRANSITIONS[_EXPDIGITS, [_SPACE, _ZERO, _NONZERO]] = [
+    _TRAILREAL, _EXPDIGITS, _EXPDIGITS]
+_TRANSITIONS[_TRAILINT, _SPACE] = _TRAILINT
+_TRANSITIONS[_TRAILREAL, _SPACE] = _TRAILREAL
+
+_STATE_KINDS = np.full(13, STRING, dtype=np.int8)
+_STATE_KINDS[[_INT, _ZEROINT, _TRAILINT]] = INTEGER
+_STATE_KINDS[[_LEADZERO, _FRAC, _EXPDIGITS, _TRAILREAL]] = REAL
+
+_INT64_MIN = np.iinfo(np.int64).min
+_INT64_MAX = np.iinfo(np.int64).max
+
+# states in which a sign starts an exponent without "E", e.g. 1.-3
+_IMPLICIT_EXP_STATES = np.zeros(13, dtype=bool)
+_IMPLICIT_EXP_STATES[[_INT, _ZEROINT, _LEADZERO, _FRAC]] = True
+
+
+def _insert_exponents(raw, exponent_i):
+    """Insert "E" into each string of *raw* at the index
+    *exponent_i*.
+    """
+    chars = raw.reshape(-1, 1).view(np.uint32)
+    width = chars.shape[1]
+    columns = np.arange(width + 1)
+    # characters after the exponent sign shift right by one
+    source = columns - (columns > exponent_i[:, None])
+    fixed = np.take_along_axis(chars, source, axis=1)
+    fixed[columns == exponent_i[:, None]] = ord("E")
+    return fixed.view("<U{}".format(width + 1)).ravel()
+
+
+def read_fields_array(raw):
+    """Convert an array of raw field strings to values, the same as
+    :func:`~bulkdata.field.read_field` would for each string. Fields
+    are classified and converted with array operations; fields with
+    non-ASCII characters are converted one by one.
+
+    :param raw: The 1-D array-like of raw field strings
+    :return: A tuple ``(ints, floats, strs, kinds)`` of arrays with the
+             length of *raw*. *kinds* holds the kind of each field,
+             :data:`INTEGER`, :data:`REAL` or :data:`STRING`. *ints*
+             holds the ``int64`` integer values, *floats* the
+             ``float64`` real values and *strs* the stripped strings,
+             with 0, NaN and ``""`` in the places of fields of other
+             kinds. Integers outside of the ``int64`` range are
+             converted to :data:`REAL`.
+    """
+    raw = np.asarray(raw, dtype=str).reshape(-1)
+    numfields = len(raw)
+    ints = np.zeros(numfields, dtype=np.int64)
+    floats = np.full(numfields, np.nan)
+    strs = np.full(numfields, "", dtype=raw.dtype)
+    kinds = np.full(numfields, STRING, dtype=np.int8)
+    if not numfields or raw.dtype.itemsize == 0:
+        return ints, floats, strs, kinds
+
+    chars = raw.reshape(-1, 1).view(np.uint32)
+    lengths = np.char.str_len(raw)
+    ascii_ = (chars < 128).all(axis=1)
+    char_classes = _CHAR_CLASSES[np.minimum(chars, 127)]
+    char_classes[np.arange(chars.shape[1]) >= lengths[:, None]] = _PAD
+
+    # run the scanner over the columns of characters
+    states = np.full(numfields, _START, dtype=np.int8)
+    exponent_i = np.full(numfields, -1)
+    for i in range(chars.shape[1]):
+        column_classes = char_classes[:, i]
+        implicit = (column_classes == _SIGN) & _IMPLICIT_EXP_STATES[states]
+        exponent_i[implicit] = i
+        states = _TRANSITIONS[states, column_classes]
+    kinds[:] = _STATE_KINDS[states]
+    # integers of more than 18 characters may not fit in int64
+    slow = ~ascii_ | ((kinds == INTEGER) & (lengths > 18))
+    kinds[slow] = STRING
+
+    is_int = kinds == INTEGER
+    ints[is_int] = raw[is_int].astype(np.int64)
+    is_real = kinds == REAL
+    implicit = is_real & (exponent_i >= 0)
+    explicit = is_real & ~implicit
+    floats[explicit] = raw[explicit].astype(np.float64)
+    if implicit.any():
+        floats[implicit] = _insert_exponents(
+            raw[implicit], exponent_i[implicit]).astype(np.float64)
+    is_str = (kinds == STRING) & ~slow
+    strs[is_str] = np.char.strip(raw[is_str])
+
+    for i in np.flatnonzero(slow).tolist():
+        value = read_field(raw[i])
+        if isinstance(value, int) and _INT64_MIN <= value <= _INT64_MAX:
+            kinds[i] = INTEGER
+            ints[i] = value
+        elif isinstance(value, (int, float)):
+            kinds[i] = REAL
+            floats[i] = value
+        else:
+            strs[i] = value
+
+    return ints, floats, strs, kinds
+
+
+def raw_fields_array(cards, numfields=None):
+    """Get the raw field strings of *cards* as a 2-D array, with
+    one row per card and one column per field. Missing fields are
+    blank.
+
+    :param cards: The sequence of cards
+    :param numfields: The number of columns, defaults to ``None``,
+                      which is the number of fields of the longest card
+    :return: The 2-D array of raw field strings
+    """
+    if numfields is None:
+        numfields = max((len(card.fields) for card in cards), default=0)
+    rows = []
+    for card in cards:
+        row = [field.raw for field in card.fields[:numfields]]
+        row.extend([""] * (numfields - len(row)))
+        rows.append(row)
+    return np.array(rows, dtype=str).reshape(len(cards), numfields)
+
+
+def column_array(raw):
+    """Convert a column of raw field strings to a typed array.
+
+    If all non-blank fields are integers, the array is ``int64`` with
+    blank fields set to 0. If all non-blank fields are numbers,
+    the array is ``float64`` with blank fields set to NaN. Otherwise
+    the array is of ``object`` type, containing the field values, with
+    ``""`` for blank fields.
+
+    :param raw: The 1-D array of raw field strings
+    :return: The typed array
+    """
+    raw = np.asarray(raw)
+    # columns of few distinct values, e.g. coordinate system IDs,
+    # are converted once per distinct value
+    sample = raw[:1000]
+    if len(raw) > len(sample) and len(np.unique(sample)) <= 100:
+        uniques, inverse = np.unique(raw, return_inverse=True)
+        return _column_array(uniques)[inverse.reshape(-1)]
+    return _column_array(raw)
+
+
+def _column_array(raw):
+    ints, floats, strs, kinds = read_fields_array(raw)
+    numbers = kinds[(kinds != STRING) | (strs != "")]
+
+    if (numbers == INTEGER).all():
+        return ints
+    is_int = kinds == INTEGER
+    if (numbers != STRING).all():
+        floats[is_int] = ints[is_int]
+        return floats
+    values = strs.astype(object)
+    values[is_int] = ints[is_int].astype(object)
+    is_real = kinds == REAL
+    values[is_real] = floats[is_real].astype(object)
+    return values
+
+
+def cards_to_arrays(cards, columns=None):
+    """Convert the fields of *cards* to columns of typed arrays,
+    see :func:`~bulkdata.arrays.column_array`.
+
+    :param cards: The sequence of cards
+    :param columns: The column names, by field index. Fields with a
+                    ``None`` name are skipped. Defaults to ``None``,
+                    which names the columns by field index.
+    :return: An ``OrderedDict`` of the typed arrays, by column name,
+             in field order
+    """
+    if columns is None:
+        raw = raw_fields_array(cards)
+        columns = range(raw.shape[1])
+    else:
+        raw = raw_fields_array(cards, len(columns))
+    return OrderedDict(
+        (column, column_array(raw[:, i]))
+        for i, column in enumerate(columns)
+        if column is not None
+    )
+
+
+def format_column(column, fieldspan=1):
+    """Convert a column of values to raw field strings, the same
+    as :func:`~bulkdata.field.write_field` would for each value.
+    Booleans are written as the integers 1 and 0, the same as
+    :func:`~bulkdata.field.write_field` writes ``True`` and ``False``.
+
+    :param column: The 1-D array-like of values
+    :param fieldspan: The number of field cells each value spans,
+                      defaults to 1
+    :return: The list of raw field strings
+    """
+    column = np.asarray(column)
+    kind = column.dtype.kind
+    width = fieldspan * 8
+
+    if kind in "biu":
+        if kind == "b":
+            column = column.astype(np.int64)
+        # unsigned integers are kept as is, they may not fit in int64
+        raws = np.char.mod("%d", column)
+        too_long = np.char.str_len(raws) > width
+        if too_long.any():
+            raise RuntimeError("field={!r} is not {} characters long"
+                               .format(raws[too_long][0], width))
+        return raws.tolist()
+    elif kind == "f" and fieldspan == 1:
+        return np.char.strip(print_float_8_array(column)).tolist()
+    elif kind == "f" and fieldspan == 2:
+        return np.char.strip(print_float_16_array(column)).tolist()
+    elif kind in "fU":
+        # each distinct value is only formatted once
+        uniques, inverse = np.unique(column, return_inverse=True)
+        raws = [write_field(unique, fieldspan) for unique in uniques.tolist()]
+        return [raws[i] for i in inverse.reshape(-1).tolist()]
+    else:
+        return [write_field(value, fieldspan) for value in column.tolist()]
+
+
+def arrays_to_cards(name, columns, fieldspan=1):
+    """Create cards named *name* from columns of field values, one
+    card per row. The cards are created with
+    :meth:`~bulkdata.card.Card.from_raw`, from the formatted columns.
+
+    :param name: The card name
+    :param columns: The sequence of columns, or an ``OrderedDict``
+                    of columns as returned by
+                    :func:`~bulkdata.arrays.cards_to_arrays`. Each
+                    column is a 1-D array-like of values, or a single
+                    value shared by every card.
+    :param fieldspan: The number of field cells the values of each
+                      column span, a single int or one per column,
+                      defaults to 1
+    :return: The list of cards
+    """
+    if isinstance(columns, Mapping):
+        # the fields are in column order, which a dict does not keep
+        # before Python 3.7
+        if not isinstance(columns, OrderedDict):
+            raise TypeError("columns must be a sequence or an OrderedDict, "
+                            "not {}".format(type(columns).__name__))
+        columns = list(columns.values())
+    if isinstance(fieldspan, int):
+        fieldspan = [fieldspan] * len(columns)
+
+    lengths = {len(column) for column in columns if np.ndim(column) > 0}
+    if len(lengths) > 1:
+        raise ValueError("columns have different lengths: {}"
+                         .format(sorted(lengths)))
+    numcards = lengths.pop() if lengths else 1
+
+    # raw field strings, one list per field cell, and the part of
+    # each cell in its split value, 0 if the value is not split
+    cells = []
+    parts = []
+    for column, span in zip(columns, fieldspan):
+        if np.ndim(column) == 0:
+            raws = [write_field(column, span)] * numcards
+        else:
+            raws = format_column(column, span)
+        if span == 1:
+            cells.append(raws)
+            parts.append(0)
+        else:
+            for start in range(0, span * 8, 8):
+                cells.append([raw[start:start + 8].strip() for raw in raws])
+                parts.append(start // 8 + 1)
+
+    # the fields are only created once the cards are used, dumping
+    # them only needs the raw strings
+    if not any(parts):
+        return [Card.from_raw(name, row) for row in zip(*cells)]
+    return [Card.from_raw(name, [SplitField.from_raw(raw, 1, part) if part
+                                 else raw
+                                 for raw, part in zip(row, parts)])
+            for row in zip(*cells)]
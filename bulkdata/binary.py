@@ -0,0 +1,221 @@
+"""The :mod:`~bulkdata.binary` module reads and writes snapshots of
+parsed bulk data in a compact binary format, which loads much faster
+than parsing the bulk data again.
+
+The file starts with a fixed size header, followed by a JSON metadata
+section and by the arrays, each aligned to 8 bytes:
+
+* ``name_index``, ``uint32`` per card: index of the card name in the
+  ``names`` list of the metadata
+* ``field_offsets``, ``uint64`` per card, plus one: index of the
+  first field of each card
+* ``raw_offsets``, ``uint64`` per field, plus one: character offset
+  of each raw field string in the text
+* ``spans``, ``uint8`` per field: field span of each field
+* ``parts``, ``uint8`` per field: part of each field in a value
+  split in cells, see :class:`~bulkdata.field.SplitField`, or 0
+* the UTF-8 encoded text of all the raw field strings, concatenated
+
+The arrays are read with :func:`numpy.frombuffer` from a memory map
+of the file.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from .card import Card
+from .error import BinaryFormatError
+from .field import Field, SplitField
+
+
+MAGIC = b"BULKDATA"
+VERSION = 1
+
+# magic, version, metadata size, number of cards, number of fields
+_HEADER = struct.Struct("<8sQQQQ")
+
+
+def _aligned(size):
+    return (size + 7) // 8 * 8
+
+
+def _array_layout(numcards, numfields, offset):
+    """Get the ``(name, dtype, count, offset)`` of each array."""
+    layout = []
+    for name, dtype, count in (("name_index", np.uint32, numcards),
+                               ("field_offsets", np.uint64, numcards + 1),
+                               ("raw_offsets", np.uint64, numfields + 1),
+                               ("spans", np.uint8, numfields),
+                               ("parts", np.uint8, numfields)):
+        layout.append((name, dtype, count, offset))
+        offset = _aligned(offset + np.dtype(dtype).itemsize * count)
+    layout.append(("text", np.uint8, None, offset))
+    return layout
+
+
+def write_binary(path, header, cards, meta=None, trailing_comment=""):
+    """Write a snapshot of *cards* to the binary file at *path*. The
+    file is written next to *path* first, and then moved into place.
+
+    :param path: The binary file path
+    :param header: The deck header
+    :param cards: The sequence of cards
+    :param meta: A dict of extra JSON serializable metadata, stored
+                 under the "user" key, defaults to ``None``
+    :param trailing_comment: The comment lines following the last
+                             card, defaults to ``""``
+    """
+    # string table of the card names
+    names = []
+    name_ids = {}
+    name_index = []
+    comments = []
+    field_offsets = [0]
+    raws = []
+    spans = []
+    parts = []
+    for i, card in enumerate(cards):
+        name = card.name
+        name_id = name_ids.get(name)
+        if name_id is None:
+            name_id = name_ids[name] = len(names)
+            names.append(name)
+        name_index.append(name_id)
+        if card.comment:
+            comments.append([i, card.comment])
+        for field in card.fields:
+            raws.append(field.raw)
+            spans.append(field.span)
+            parts.append(getattr(field, "part", 0))
+        field_offsets.append(len(raws))
+
+    raw_offsets = np.zeros(len(raws) + 1, dtype=np.uint64)
+    np.cumsum([len(raw) for raw in raws], out=raw_offsets[1:])
+    text = "".join(raws).encode("utf-8")
+
+    meta_bytes = json.dumps({
+        "header": header,
+        "names": names,
+        "comments": comments,
+        "trailing_comment": trailing_comment,
+        "text_size": len(text),
+        "user": meta,
+    }).encode("utf-8")
+
+    arrays = {
+        "name_index": np.array(name_index, dtype=np.uint32),
+        "field_offsets": np.array(field_offsets, dtype=np.uint64),
+        "raw_offsets": raw_offsets,
+        "spans": np.array(spans, dtype=np.uint8),
+        "parts": np.array(parts, dtype=np.uint8),
+    }
+
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as fp:
+        fp.write(_HEADER.pack(MAGIC, VERSION, len(meta_bytes),
+                              len(name_index), len(raws)))
+        fp.write(meta_bytes)
+        offset = _aligned(_HEADER.size + len(meta_bytes))
+        for name, dtype, count, array_offset in _array_layout(
+                len(name_index), len(raws), offset):
+            fp.write(b"\0" * (array_offset - fp.tell()))
+            if name == "text":
+                fp.write(text)
+            else:
+                fp.write(arrays[name].tobytes())
+    os.replace(tmp_path, path)
+
+
+def _read_meta(buffer):
+    if len(buffer) < _HEADER.size:
+        raise BinaryFormatError("file too short for a bulkdata binary file")
+    magic, version, meta_size, numcards, numfields = _HEADER.unpack_from(
+        buffer)
+    if magic != MAGIC:
+        raise BinaryFormatError("not a bulkdata binary file")
+    if version != VERSION:
+        raise BinaryFormatError("unsupported bulkdata binary version {}"
+                                .format(version))
+    meta = json.loads(bytes(buffer[_HEADER.size:_HEADER.size + meta_size])
+                      .decode("utf-8"))
+    offset = _aligned(_HEADER.size + meta_size)
+    return meta, numcards, numfields, offset
+
+
+def read_binary_meta(path):
+    """Read the metadata of the binary file at *path*, without
+    loading its cards.
+
+    :return: The dict of metadata, the extra metadata passed to
+             :func:`write_binary` is under the "user" key
+    """
+    with open(path, "rb") as fp:
+        magic, version, meta_size, _, _ = _HEADER.unpack(
+            fp.read(_HEADER.size).ljust(_HEADER.size, b"\0"))
+        if magic != MAGIC or version != VERSION:
+            raise BinaryFormatError("not a bulkdata binary file of "
+                                    "version {}".format(VERSION))
+        return json.loads(fp.read(meta_size).decode("utf-8"))
+
+
+def read_binary(path):
+    """Read the snapshot in the binary file at *path*.
+
+    :return: A tuple ``(header, cards, meta)`` of the deck header, the
+             list of cards and the dict of metadata
+    """
+    with open(path, "rb") as fp, \
+            mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        meta, numcards, numfields, offset = _read_meta(buffer)
+        arrays = {}
+        for name, dtype, count, array_offset in _array_layout(
+                numcards, numfields, offset):
+            if name == "text":
+                text_end = array_offset + meta["text_size"]
+                text = buffer[array_offset:text_end].decode("utf-8")
+            else:
+                # copy to lists, so the map can be closed
+                array = np.frombuffer(buffer, dtype, count, array_offset)
+                if name == "parts":
+                    # only the fields of split values have a part
+                    split_i = np.flatnonzero(array)
+                    arrays[name] = zip(split_i.tolist(),
+                                       array[split_i].tolist())
+                else:
+                    arrays[name] = array.tolist()
+                del array
+
+    names = meta["names"]
+    field_offsets = arrays["field_offsets"]
+    raw_offsets = arrays["raw_offsets"]
+    spans = arrays["spans"]
+    fields = [Field.from_raw(text[start:stop], span) for start, stop, span
+              in zip(raw_offsets, raw_offsets[1:], spans)]
+    for i, part in arrays["parts"]:
+        field = fields[i]
+        fields[i] = SplitField.from_raw(field.raw, field.span, part)
+
+    cards = []
+    for i, name_i in enumerate(arrays["name_index"]):
+        card = Card(names[name_i])
+        card.set_raw_fields(fields[field_offsets[i]:field_offsets[i + 1]])
+        cards.append(card)
+    for i, comment in meta["comments"]:
+        cards[i].comment = comment
+
+    return meta["header"], cards, meta
+
+
+def text_hash(text):
+    """Get the SHA-256 hex digest of the UTF-8 encoded *text*.
+    """
+    return hashlib.sha256(text.encode("utf-8", "surrogateescape")
+                          ).hexdigest()
+
+
+__all__ = ["read_binary", "read_binary_meta", "write_binary", "text_hash"]
@@ -6,6 +6,7 @@ and from bulk data card formatted strings.
 """
 
 from collections import OrderedDict
+from collections import namedtuple
 
 from .field import Field, LargeField
 from .format import format_card
@@ -13,16 +14,30 @@ from .parse import BDFParser
 from .util import islist, split_fields, repr_list
 
 
+# the name and raw cells of a card created by Card.from_raw, formatted
+# without converting the cells to fields
+_RawCard = namedtuple("_RawCard", ["name", "fields"])
+
+
 class Card:
     """:class:`~bulkdata.card.Card` class allows the user 
     to create and modify bulk data cards.
 
     :param name: The name of the card
     :param size: The number of initial blank fields, defaults to 0
+    :param comment: Comment lines written before the card when
+                    dumping it, defaults to ``""``
+
+    When dumped with ``cache=True``, the card keeps the formatted
+    string and emits it again while its name and fields are unchanged.
     """
+
+    __slots__ = ("_name", "comment", "_fields", "_dumps_cache")
     
-    def __init__(self, name=None, size=0):
+    def __init__(self, name=None, size=0, comment=""):
+        self._dumps_cache = None
         self.name = name
+        self.comment = comment
         self._fields = [self._blank_field() for _ in range(size)]
 
     def _convert_to_fields(self, value, fieldspan=1):
@@ -45,8 +60,28 @@ class Card:
             The user should avoid using this function unless he/she
             knows what they are doing.
         """
+        self._dumps_cache = None
         self._fields = fields
 
+    @classmethod
+    def from_raw(cls, name, raws):
+        """Create a card from its raw field strings, without creating
+        the `Field` objects. These are created from *raws* when the
+        fields are first used, while dumping the card only needs the
+        raw strings.
+
+        :param name: The card name
+        :param raws: The sequence of raw field strings, each of
+                     which may also be a `Field` object
+        :return: The :class:`~bulkdata.card.Card` object
+        """
+        card = cls.__new__(cls)
+        card._dumps_cache = None
+        card.name = name
+        card.comment = ""
+        card._fields = tuple(raws)
+        return card
+
     def append(self, value, fieldspan=1):
         """Append a field value to card fields.
 
@@ -54,7 +89,8 @@ class Card:
         :param fieldspan: The number of field cells the value spans,
                           defaults to 1
         """
-        self._fields.extend(self._convert_to_fields(value, fieldspan))
+        self._dumps_cache = None
+        self.fields.extend(self._convert_to_fields(value, fieldspan))
 
     def extend(self, values, fieldspan=1):
         """Extend card fields with sequence of field values.
@@ -63,17 +99,19 @@ class Card:
         :param fieldspan: The number of field cells that each value spans,
                           defaults to 1
         """
+        self._dumps_cache = None
         if fieldspan == 1:
             fields = [Field(value) for value in values]
-            self._fields.extend(fields)
+            self.fields.extend(fields)
         else:
             for value in values:
-                self._fields.extend(self._convert_to_fields(value, fieldspan))
+                self.fields.extend(self._convert_to_fields(value, fieldspan))
 
     def pop(self):
         """Remove the last field.
         """
-        return self._fields.pop()
+        self._dumps_cache = None
+        return self.fields.pop()
         
     def resize(self, size):
         """Resize the card fields to contain *size* fields. If current
@@ -83,28 +121,31 @@ class Card:
 
         :param size: The desired number of fields
         """
+        self._dumps_cache = None
         numfields = len(self._fields)
         diff = size - numfields
         if diff > 0:
             for _ in range(diff):
-                self._fields.append(Field(None))
+                self.fields.append(Field(None))
         if diff < 0:
             for _ in range(abs(diff)):
-                self._fields.pop()
+                self.fields.pop()
     
     def strip(self): #TODO: rename to rstrip ?
         """Remove any trailing blank fields.
         """
+        self._dumps_cache = None
         for i in reversed(range(len(self._fields))):
-            if not self._fields[i]:
-                del self._fields[i]
+            if not self.fields[i]:
+                del self.fields[i]
             else:
                 break
         
     def _setsinglefield(self, index, value):
-        """Set a single field value at the index.
+        """Set a single field value at the index, keeping the width
+        of the field it replaces.
         """
-        self._fields[index] = Field(value)
+        self.fields[index] = Field(value, self.fields[index].span)
         
     def _setmultifieldlist(self, indexs, values):
         """Set list of field values at the given indexes.
@@ -137,7 +178,7 @@ class Card:
                 new_field = fields[i]
             except IndexError:
                 new_field = self._blank_field()
-            self._fields[index] = new_field
+            self.fields[index] = new_field
     
     def _setmultifield(self, indexs, value):
         """Set field value(s) spanning multiple field cells.
@@ -163,6 +204,7 @@ class Card:
                     the field(s)
         :param value: The field value(s) to set
         """
+        self._dumps_cache = None
         if isinstance(key, int):
             self._setsinglefield(key, value)
         elif isinstance(key, slice):
@@ -176,12 +218,12 @@ class Card:
     def _getsinglefield(self, index):
         """Get a single field value at the index.
         """
-        return self._fields[index].value
+        return self.fields[index].value
 
     def _getmultifield(self, indexs):
         """Get list of field values at the given indexes.
         """
-        return [self._fields[i].value for i in indexs]
+        return [self.fields[i].value for i in indexs]
 
     def __getitem__(self, key):
         """Get field item from the card.
@@ -211,9 +253,9 @@ class Card:
         if isinstance(key, int):
             return self._getsinglefield(key)
         elif isinstance(key, slice):
-            fields = self._fields[key]
+            fields = self.fields[key]
         elif islist(key): 
-            fields = [self._fields[i] for i in key]
+            fields = [self.fields[i] for i in key]
         else:
             raise TypeError(key, type(key))
         return LargeField.join(fields).value
@@ -225,16 +267,62 @@ class Card:
         :param key: The indexing key denoting which field(s)
                     to delete
         """
-        self._fields.__delitem__(key)
+        self._dumps_cache = None
+        self.fields.__delitem__(key)
             
-    def dumps(self, format="fixed"):
+    def dumps(self, format="fixed", cache=False):
         """Dump the card to bulk data formatted string.
 
         :param format: the desired format, can be one of: 
-                       ["free", "fixed"], defaults to "fixed"
+                       ["free", "fixed", "large"], defaults to "fixed"
+        :param cache: If ``True``, keep the formatted string to return
+                      it again from the next dumps to *format*, as
+                      long as the card is unchanged, defaults to
+                      ``False``
         :return: The bulk data card string representation
         """
-        return format_card(self, format)
+        cached = self._dumps_cache
+        if cached is not None and cached[0] == format and \
+                self._is_unchanged(cached[1], cached[2]):
+            card_str = cached[3]
+        else:
+            fields = self._fields
+            if type(fields) is tuple:
+                card_str = format_card(_RawCard(self._name, fields), format)
+                if cache:
+                    # the raw cells do not change until they are
+                    # converted to fields
+                    self._dumps_cache = (format, fields, None, card_str)
+            else:
+                card_str = format_card(self, format)
+                if cache:
+                    fields = list(fields)
+                    raws = [field.raw for field in fields]
+                    self._dumps_cache = (format, fields, raws, card_str)
+        if self.comment:
+            return self.comment + "\n" + card_str
+        else:
+            return card_str
+
+    def _is_unchanged(self, fields, raws):
+        """Return ``True`` if the card holds the same *fields*, and
+        they still hold the *raws* field strings.
+        """
+        current = self._fields
+        if raws is None:
+            return current is fields
+        if len(current) != len(fields):
+            return False
+        for field, cached_field, raw in zip(current, fields, raws):
+            if field is not cached_field or field.raw != raw:
+                return False
+        return True
+
+    def clear_dumps_cache(self):
+        """Clear the formatted string kept by
+        :meth:`~bulkdata.card.Card.dumps`.
+        """
+        self._dumps_cache = None
     
     @classmethod
     def loads(cls, card_str):
@@ -245,15 +333,19 @@ class Card:
         :return: The loaded :class:`~bulkdata.card.Card` object
         """
         card_name, card_fields = BDFParser(card_str).parse_card()
+        fieldspan = 1
+        if card_name.endswith(BDFParser.LARGEMARK):
+            # large field card, fields are 16 characters wide
+            card_name, fieldspan = card_name[:-1], 2
         obj = cls(card_name)
-        obj.set_raw_fields([Field(value) for value in card_fields])
+        obj.set_raw_fields([Field(value, fieldspan) for value in card_fields])
         
         return obj
 
     def values(self):
         """Get a list of the values of the card fields.
         """
-        return [field.value for field in self._fields]
+        return [field.value for field in self.fields]
     
     def __contains__(self, value):
         """Return ``True`` if the card contains a field
@@ -261,7 +353,7 @@ class Card:
 
         :param value: The specified value
         """
-        return self._fields.__contains__(value)
+        return self.fields.__contains__(value)
     
     def __str__(self):
         """Dump the card to as a bulk data card string
@@ -274,7 +366,7 @@ class Card:
     def __len__(self):
         """Return number of fields in the card.
         """
-        return self.fields.__len__()
+        return self._fields.__len__()
 
     def __iter__(self):
         """Iterate through the fields in the card.
@@ -285,7 +377,7 @@ class Card:
         """Return ``True`` if the card contains any fields,
         ``False`` otherwise.
         """ 
-        return bool(self.fields)
+        return bool(self._fields)
 
     def __repr__(self):
         return "{}(\"{}\", {})".format(self.__class__.__name__, 
@@ -300,6 +392,7 @@ class Card:
     
     @name.setter
     def name(self, new_name):
+        self._dumps_cache = None
         if new_name:
             new_name = new_name.strip()
         self._name = new_name
@@ -308,7 +401,13 @@ class Card:
     def fields(self):
         """The card fields.
         """
-        return self._fields
+        fields = self._fields
+        if type(fields) is tuple:
+            # raw cells of Card.from_raw, converted on first use
+            fields = [field if isinstance(field, Field)
+                      else Field.from_raw(field) for field in fields]
+            self._fields = fields
+        return fields
 
 
 # class CardType:
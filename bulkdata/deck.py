@@ -2,12 +2,72 @@
 :class:`~bulkdata.deck.Deck` class.
 """
 
+import asyncio
+from bisect import bisect_left, insort
+from collections import deque
 from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import as_completed
+from itertools import islice
+import multiprocessing
+import os
+import sys
 
+from .arrays import arrays_to_cards, cards_to_arrays
+from .binary import read_binary, read_binary_meta, text_hash, write_binary
 from .card import Card
+from .error import BinaryFormatError
 from .field import Field, write_field
 from .util import islist, repr_list
-from .parse import BDFParser
+from .parse import BDFParser, _parse_chunk, iter_mmap_lines
+from .query import Query, iter_index_value
+
+
+# number of cards formatted by each task of a parallel dump
+_DUMP_CHUNK_SIZE = 10000
+
+# cards of the deck being dumped, only set in the dump workers
+_dump_cards = None
+
+
+def _dumps_cards(cards, format):
+    return "".join([card.dumps(format) for card in cards])
+
+
+def _init_dump_worker(cards):
+    global _dump_cards
+    _dump_cards = cards
+
+
+def _dumps_dump_cards(start, stop, format):
+    return _dumps_cards(_dump_cards[start:stop], format)
+
+
+def _parse_file(path, keep_comments, resolve_includes):
+    # (name, fields) tuples pickle much faster than cards
+    include_dir = None
+    if resolve_includes:
+        include_dir = os.path.dirname(os.path.abspath(path))
+    with open(path) as fp:
+        parser = BDFParser(fp.read(), keep_comments=keep_comments,
+                           include_dir=include_dir)
+    header, card_tuples = parser.parse()
+    return header, card_tuples, parser.comments, parser.trailing_comment
+
+
+def _load_cards(lines, keep_comments):
+    # parses a chunk of lines starting at a card, in any executor
+    card_tuples, comments, trailing_comment = _parse_chunk(lines,
+                                                           keep_comments)
+    cards = [Deck._load_card(name, fields, comments.get(i, ""))
+             for i, (name, fields) in enumerate(card_tuples)]
+    return cards, trailing_comment
+
+
+_executors = {
+    "process": ProcessPoolExecutor,
+    "thread": ThreadPoolExecutor
+}
 
 
 class Deck():
@@ -21,11 +81,173 @@ class Deck():
     :param header: the header, which is prepended to the bulk
                     data section when dumping the deck, 
                     defaults to ``None``.
+    :param trailing_comment: comment lines following the last card,
+                             written before ``ENDDATA`` when dumping
+                             the deck, defaults to ``None``.
+
+    The deck keeps an index of card positions by card name, so
+    queries filtering on name only visit the matching cards. Field
+    value indexes may be added with
+    :meth:`~bulkdata.deck.Deck.create_index`. The indexes follow
+    changes made through the deck methods, and are rebuilt when cards
+    were added to or removed from :attr:`cards` otherwise. After
+    renaming or changing indexed fields of cards in place, or setting
+    cards into :attr:`cards` directly, call
+    :meth:`~bulkdata.deck.Deck.reindex`.
     """
     
-    def __init__(self, cards=None, header=None):
+    def __init__(self, cards=None, header=None, trailing_comment=None):
         self._cards = cards or []
         self.header = header or ""
+        self.trailing_comment = trailing_comment or ""
+        # card positions by card name, built on first use
+        self._name_index = None
+        # card positions by field value, keyed by (name, field index),
+        # built on first use
+        self._field_indexes = {}
+        # the indexes hold card ids rather than positions, so deleting
+        # cards does not shift them. The ids increase along the cards,
+        # None while the id of each card is its position
+        self._ids = None
+        # number of cards covered by the indexes, differs from the
+        # number of cards once cards were added or removed directly
+        self._numindexed = len(self._cards)
+
+    def create_index(self, name, field_index):
+        """Create an index of the cards named *name* by the value of
+        their field at *field_index*. Queries filtering on both *name*
+        and the value of that field then only visit the matching
+        cards. This applies to :meth:`~bulkdata.deck.Deck.find`,
+        :meth:`~bulkdata.deck.Deck.find_one`,
+        :meth:`~bulkdata.deck.Deck.replace`,
+        :meth:`~bulkdata.deck.Deck.update` and
+        :meth:`~bulkdata.deck.Deck.delete`.
+
+        .. code-block:: python
+
+            deck.create_index("GRID", 0)
+            grid = deck.find_one({"name": "GRID",
+                                  "fields": {"index": 0, "value": 101}})
+
+        :param name: The card name
+        :param field_index: The field index
+        """
+        self._field_indexes[(name, field_index)] = None
+
+    def drop_index(self, name, field_index):
+        """Drop the index created with
+        :meth:`~bulkdata.deck.Deck.create_index`.
+
+        :param name: The card name
+        :param field_index: The field index
+        """
+        del self._field_indexes[(name, field_index)]
+
+    def reindex(self):
+        """Rebuild the deck indexes from the current cards.
+        """
+        self._name_index = None
+        for key in self._field_indexes:
+            self._field_indexes[key] = None
+        self._ids = None
+        self._numindexed = len(self._cards)
+
+    def _check_indexes(self):
+        if self._numindexed != len(self._cards):
+            self.reindex()
+
+    def _has_indexes(self):
+        return (self._name_index is not None
+                or any(field_index is not None
+                       for field_index in self._field_indexes.values()))
+
+    def _card_id(self, i):
+        if self._ids is None:
+            return i
+        return self._ids[i]
+
+    def _positions(self, card_ids):
+        if self._ids is None:
+            return list(card_ids)
+        ids = self._ids
+        return [bisect_left(ids, card_id) for card_id in card_ids]
+
+    def _add_ids(self, numcards):
+        self._numindexed += numcards
+        if self._ids is not None:
+            start = self._ids[-1] + 1 if self._ids else 0
+            self._ids.extend(range(start, start + numcards))
+
+    def _get_name_index(self):
+        if self._name_index is None:
+            ids = self._ids
+            if ids is None:
+                ids = range(len(self._cards))
+            name_index = {}
+            for card_id, card in zip(ids, self._cards):
+                name_index.setdefault(card.name, []).append(card_id)
+            self._name_index = name_index
+        return self._name_index
+
+    def _get_field_index(self, key):
+        field_index = self._field_indexes[key]
+        if field_index is None:
+            name, index = key
+            field_index = {}
+            card_ids = self._get_name_index().get(name, ())
+            for card_id, i in zip(card_ids, self._positions(card_ids)):
+                try:
+                    value = self._cards[i].fields[index].value
+                except IndexError:
+                    continue
+                field_index.setdefault(value, []).append(card_id)
+            self._field_indexes[key] = field_index
+        return field_index
+
+    def _index_card(self, i, card):
+        self._check_indexes()
+        card_id = self._card_id(i)
+        if self._name_index is not None:
+            insort(self._name_index.setdefault(card.name, []), card_id)
+        for (name, index), field_index in self._field_indexes.items():
+            if field_index is not None and name == card.name:
+                try:
+                    value = card.fields[index].value
+                except IndexError:
+                    continue
+                insort(field_index.setdefault(value, []), card_id)
+
+    def _remove_id(self, index, key, card_id):
+        card_ids = index[key]
+        j = bisect_left(card_ids, card_id)
+        if j == len(card_ids) or card_ids[j] != card_id:
+            raise KeyError(key)
+        del card_ids[j]
+        if not card_ids:
+            del index[key]
+
+    def _unindex_card(self, i, card):
+        self._check_indexes()
+        card_id = self._card_id(i)
+        if self._name_index is not None:
+            try:
+                self._remove_id(self._name_index, card.name, card_id)
+            except KeyError:
+                # card was renamed in place, rebuild on next use
+                self.reindex()
+                return
+        for key, field_index in self._field_indexes.items():
+            name, index = key
+            if field_index is not None and name == card.name:
+                try:
+                    value = card.fields[index].value
+                except IndexError:
+                    continue
+                try:
+                    self._remove_id(field_index, value, card_id)
+                except KeyError:
+                    # card was changed in place, rebuild on next use
+                    self._field_indexes[key] = None
         
     def append(self, card):
         """Append a card to the deck.
@@ -33,93 +255,54 @@ class Deck():
         :param card: The card to append
         """
         self._cards.append(card)
+        self._add_ids(1)
+        self._index_card(len(self._cards) - 1, card)
         
     def extend(self, cards):
         """Extend deck cards with sequence of cards.
 
         :param cards: The sequence of cards
         """
+        start = len(self._cards)
         self._cards.extend(cards)
+        self._add_ids(len(self._cards) - start)
+        for i in range(start, len(self._cards)):
+            self._index_card(i, self._cards[i])
     
-    def _iter(self, value):
-        if islist(value):
-            for each in value:
-                yield each
-        else:
-            yield value
-            
-    def _iter_index_value(self, dict_):
-        index = dict_["index"]
-        value = dict_["value"]
-        if islist(value):
-            if not islist(index):
-                raise TypeError("value is type {} but index is type {}"
-                                .format(type(value), type(index)))
-            for each_index, each_value in zip(index, value):
-                yield each_index, each_value
-        else:
-            yield index, value
-        
-    def _matches_name(self, filter, card):
-        try:
-            return card.name == filter["name"]
-        except KeyError:
-            return True
-        
-    def _matches_fields(self, filter, card):
-        filter_fields = filter.get("fields")
-        if filter_fields:
-            match = True
-            for index, value in self._iter_index_value(filter_fields):
-                try:
-                    match *= (card.fields[index].value == value)
-                except IndexError:
-                    return False
-            return match
-        else:
-            return True
-        
-    def _matches_contains(self, filter, card):
-        filter_contains = filter.get("contains")
-        if filter_contains:
-            filter_contains = [
-                value
-                for value in self._iter(filter_contains)
-            ]
-            # loop through fields, popping off matches
-            for field in card.fields:
-                try:
-                    filter_contains.remove(field.value)
-                except ValueError:
-                    continue
-            # match if all `contains` values found
-            match = len(filter_contains) == 0
-            return match
+    def _enumerate_candidates(self, query):
+        """Enumerate the cards that may match *query*, using the
+        indexes when the query has a name.
+        """
+        if query.has_name:
+            self._check_indexes()
+            name = query.name
+            positions = self._get_name_index().get(name, ())
+            if query.fields and self._field_indexes:
+                for index, value in query.fields:
+                    key = (name, index)
+                    if isinstance(index, int) and key in self._field_indexes:
+                        positions = self._get_field_index(key).get(value, ())
+                        break
+            # copies the positions, cards may be set while iterating
+            positions = self._positions(positions)
+            cards = self._cards
+            return ((i, cards[i]) for i in positions)
         else:
-            return True
-        
-    def _matches(self, filter, card):
-        match = True
-        match *= self._matches_name(filter, card)
-        match *= self._matches_fields(filter, card)
-        match *= self._matches_contains(filter, card)
-        return match
-    
-    def _enumerate_find(self, filter=None):
-        filter = filter or {}
-        if filter:
-            for i, card in enumerate(self._cards):
-                if self._matches(filter, card):
+            return enumerate(self._cards)
+
+    def _enumerate_find(self, query):
+        if query:
+            for i, card in self._enumerate_candidates(query):
+                if query(card):
                     yield i, card
         else:
             for i, card in enumerate(self._cards):
                 yield i, card
     
-    def _enumerate_find_one(self, filter=None):
-        filter = filter or {}
-        if filter:
-            for i, card in enumerate(self._cards):
-                if self._matches(filter, card):
+    def _enumerate_find_one(self, query):
+        if query:
+            for i, card in self._enumerate_candidates(query):
+                if query(card):
                     return i, card
             return None, None
         else:
@@ -129,17 +312,28 @@ class Deck():
                 return None, None
 
     def _normalize_filter(self, filter):
-        if filter is None:
-            return {}
-        elif isinstance(filter, str):
-            return {"name": filter}
-        else:
+        if isinstance(filter, Query):
             return filter
+        else:
+            return Query(filter)
+
+    @staticmethod
+    def compile(filter):
+        """Compile *filter* into a :class:`~bulkdata.query.Query`,
+        a reusable predicate that may be passed to any method
+        accepting a filter. Queries repeated in a loop should be
+        compiled once, rather than passing the filter dict each time.
+
+        :type filter: dict, str
+        :param filter: The filter, see :meth:`~bulkdata.deck.Deck.find`
+        :return: The compiled :class:`~bulkdata.query.Query`
+        """
+        return Query(filter)
 
     def find(self, filter=None):
         """Find cards matching the query denoted by *filter*.
 
-        :type filter: dict, str
+        :type filter: dict, str, Query
         :param filter: Specifies which cards to find.
         :return: A generator object iterating through every card
                  matching the filter.
@@ -198,6 +392,9 @@ class Deck():
 
             AERO    3       1.3     100.    .00001  1       -1
 
+        If *filter* is a :class:`~bulkdata.query.Query`, as returned
+        by :meth:`~bulkdata.deck.Deck.compile`, it is used as is.
+
         """
         filter = self._normalize_filter(filter)
         for _, card in self._enumerate_find(filter):
@@ -206,7 +403,7 @@ class Deck():
     def find_one(self, filter=None):
         """Find the first card matching the query denoted by *filter*.
 
-        :type filter: dict, str
+        :type filter: dict, str, Query
         :param filter: Specifies which card to find.
         :return: The first matching card, or ``None`` if no match
                  is found.
@@ -219,19 +416,20 @@ class Deck():
         """Replace cards matching the query denoted by
         *filter* with *card*.
 
-        :type filter: dict, str
+        :type filter: dict, str, Query
         :param filter: Specifies which cards to replace.
         :param card: The replacement card
         """
         filter = self._normalize_filter(filter)
-        for i, _ in self._enumerate_find(filter):
-            self._cards[i] = card
+        replace_i = [i for i, _ in self._enumerate_find(filter)]
+        for i in replace_i:
+            self._set_card_by_index(i, card)
 
     def replace_one(self, filter, card):
         """Replace the first card matching the query denoted by
         *filter* with *card*.
 
-        :type filter: dict, str
+        :type filter: dict, str, Query
         :param filter: Specifies which card to replace.
         :param card: The replacement card
         :return: The replacement card, or ``None`` if no match
@@ -240,13 +438,13 @@ class Deck():
         filter = self._normalize_filter(filter)
         i, _ = self._enumerate_find_one(filter)
         if i:
-            self._cards[i] = card
+            self._set_card_by_index(i, card)
             return card
         else:
             return None
             
     def _update_card(self, card, update):
-        for index, value in self._iter_index_value(update):
+        for index, value in iter_index_value(update):
             card[index] = value
     
     def update(self, filter, update):
@@ -260,28 +458,92 @@ class Deck():
             has not been well tested, and does not appear to add any
             functionality not achieved otherwise.
 
-        :type filter: dict, str
+        :type filter: dict, str, Query
         :param filter: Specifies which cards to replace.
         :param card: The replacement card
         """
         filter = self._normalize_filter(filter)
-        for i, _ in self._enumerate_find(filter):
-            self._update_card(self._cards[i], update)
+        update_i = [i for i, _ in self._enumerate_find(filter)]
+        for i in update_i:
+            card = self._cards[i]
+            self._unindex_card(i, card)
+            try:
+                self._update_card(card, update)
+            finally:
+                self._index_card(i, card)
     
     def delete(self, filter=None):
         """Delete cards matching the query denoted by
         *filter*.
 
-        :type filter: dict, str
+        :type filter: dict, str, Query
         :param filter: Specifies which cards to delete.
         :return: The number of cards deleted.
         """
         filter = self._normalize_filter(filter)
         delete_i = [i for i, _ in self._enumerate_find(filter)]
+        if delete_i and self._ids is None and self._has_indexes():
+            # positions after the deleted cards shift, the ids do not
+            self._ids = list(range(len(self._cards)))
         for i in reversed(delete_i):
+            self._unindex_card(i, self._cards[i])
             del self._cards[i]
+            self._numindexed -= 1
+            if self._ids is not None:
+                del self._ids[i]
         return len(delete_i)
             
+    def to_arrays(self, name, columns=None):
+        """Get the fields of the cards named *name* as columns of
+        NumPy arrays, one element per card. Columns of integer fields
+        are ``int64`` arrays, with blank fields set to 0. Columns of
+        number fields are ``float64`` arrays, with blank fields set to
+        NaN. Any other column is an ``object`` array of the field values.
+
+        .. code-block:: python
+
+            grid = deck.to_arrays("GRID", ["id", "cp", "x", "y", "z", "cd"])
+            xyz = np.column_stack([grid["x"], grid["y"], grid["z"]])
+
+        :param name: The card name
+        :param columns: The column names, by field index. Fields with a
+                        ``None`` name are skipped. Defaults to ``None``,
+                        which names the columns by field index.
+        :return: An ``OrderedDict`` of the arrays, by column name,
+                 in field order
+        """
+        return cards_to_arrays(self._get_cards_by_name(name), columns)
+
+    @classmethod
+    def from_arrays(cls, name, columns, fieldspan=1):
+        """Create a :class:`~bulkdata.deck.Deck` object of cards named
+        *name* from columns of field values, one card per row. The
+        values of each column are formatted together, which is much
+        faster than appending them to cards one by one. The cards only
+        create their fields once used, see
+        :meth:`~bulkdata.card.Card.from_raw`.
+
+        .. code-block:: python
+
+            deck = Deck.from_arrays("GRID", OrderedDict([
+                ("id", np.arange(1, n + 1)),
+                ("cp", None),
+                ("x", x), ("y", y), ("z", z)
+            ]))
+
+        :param name: The card name
+        :param columns: The sequence of columns, or an ``OrderedDict``
+                        of columns as returned by
+                        :meth:`~bulkdata.deck.Deck.to_arrays`. Each
+                        column is a 1-D array-like of values, or a
+                        single value shared by every card.
+        :param fieldspan: The number of field cells the values of each
+                          column span, a single int or one per column,
+                          defaults to 1
+        :return: The :class:`~bulkdata.deck.Deck` object
+        """
+        return cls(arrays_to_cards(name, columns, fieldspan))
+
     def _get_card_by_index(self, index):
         return self._cards[index]
             
@@ -317,16 +579,19 @@ class Deck():
             raise TypeError(key, type(key))
             
     def _set_card_by_index(self, index, card):
+        index = range(len(self._cards))[index]
+        self._unindex_card(index, self._cards[index])
         self._cards[index] = card
+        self._index_card(index, card)
             
     def _set_cards_by_indexes(self, indexes, cards):
         for i, card in zip(indexes, cards):
-            self._cards[i] = card
+            self._set_card_by_index(i, card)
     
     def _set_cards_by_slice(self, slice_, cards):
-        steps = range(slice_.start, slice_.stop. slice_.step)
+        steps = range(*slice_.indices(len(self._cards)))
         for i, card in zip(steps, cards):
-            self._cards[i] = card
+            self._set_card_by_index(i, card)
             
     def __setitem__(self, key, value):
         """Set card(s) in the deck.
@@ -345,61 +610,502 @@ class Deck():
         else:
             raise TypeError(key, type(key))
 
+    @staticmethod
+    def _load_card(name, fields, comment=""):
+        if name is None:
+            raise Warning("Loaded cards with no name. This usually "
+                          "implies there was an error parsing the bdf file.")
+        fieldspan = 1
+        if name.endswith(BDFParser.LARGEMARK):
+            # large field card, fields are 16 characters wide
+            name, fieldspan = name[:-1], 2
+        card = Card(name, comment=comment)
+        card.set_raw_fields([Field(field_val, fieldspan)
+                             for field_val in fields])
+        return card
+
     @classmethod
-    def loads(cls, deck_str):
+    def loads(cls, deck_str, workers=None, keep_comments=False,
+              include_dir=None):
         """Load :class:`~bulkdata.deck.Deck` object from a
         bulk data string.
 
         :param deck_str: The bulk data string
+        :param workers: The number of processes to parse the bulk
+                        data with, defaults to ``None`` (no
+                        parallel parsing)
+        :param keep_comments: If ``True``, comment lines are kept in
+                              the header, or attached to the
+                              :attr:`~bulkdata.card.Card.comment` of
+                              the card that follows them, so they
+                              survive a round-trip, defaults to ``False``
+        :param include_dir: If set, ``INCLUDE`` statements in the bulk
+                            data are replaced by the cards of the
+                            included files, with relative paths taken
+                            from *include_dir*. Included files are
+                            parsed once and cached until modified,
+                            defaults to ``None`` (``INCLUDE``
+                            statements are not resolved)
         :return: The loaded :class:`~bulkdata.deck.Deck` object
         """
-        cards = []
-        header, card_tuples = BDFParser(deck_str).parse()
-
-        for name, fields in card_tuples:
-            card = Card(name)
-            fields = [Field(field_val) for field_val in fields]
-            card.set_raw_fields(fields)
-            cards.append(card)
-        obj = cls(cards, header)
+        parser = BDFParser(deck_str, keep_comments=keep_comments,
+                           include_dir=include_dir)
+        header, card_tuples = parser.parse(workers=workers)
+        return cls._from_card_tuples(header, card_tuples, parser.comments,
+                                     parser.trailing_comment)
 
-        if obj.find_one({"name": None}):
-            raise Warning("Loaded cards with no name. This usually "
-                          "implies there was an error parsing the bdf file.")
-        
-        return obj
+    @classmethod
+    def _from_card_tuples(cls, header, card_tuples, comments,
+                          trailing_comment=""):
+        cards = [cls._load_card(name, fields, comments.get(i, ""))
+                 for i, (name, fields) in enumerate(card_tuples)]
+        return cls(cards, header, trailing_comment)
 
     @classmethod
-    def load(cls, fp):
+    def load(cls, fp, workers=None, keep_comments=False,
+             resolve_includes=False, cache=False):
         """Load :class:`~bulkdata.deck.Deck` object from a
         bulk data file object.
 
         :param fp: The bulk data file object
+        :param workers: The number of processes to parse the bulk
+                        data with, defaults to ``None`` (no
+                        parallel parsing)
+        :param keep_comments: If ``True``, keep comment lines, see
+                              :meth:`~bulkdata.deck.Deck.loads`,
+                              defaults to ``False``
+        :param resolve_includes: If ``True``, resolve ``INCLUDE``
+                                 statements relative to the directory
+                                 of the file, see
+                                 :meth:`~bulkdata.deck.Deck.loads`,
+                                 defaults to ``False``
+        :param cache: If ``True``, keep a binary snapshot of the deck
+                      in a side-car file next to the bulk data file,
+                      named as the file with a ".bdcache" suffix.
+                      The snapshot is loaded instead of parsing the
+                      file again, as long as the file size,
+                      modification time and contents hash are
+                      unchanged, see
+                      :meth:`~bulkdata.deck.Deck.load_binary`. Only
+                      used for files opened by path and without
+                      *resolve_includes*, as changes to included
+                      files would go unnoticed. Defaults to ``False``
+        :return: The loaded :class:`~bulkdata.deck.Deck` object
+        """
+        path = getattr(fp, "name", None)
+        if not isinstance(path, str):
+            path = None
+
+        include_dir = None
+        if resolve_includes:
+            if path is not None:
+                include_dir = os.path.dirname(os.path.abspath(path))
+            else:
+                include_dir = os.getcwd()
+
+        if not cache or path is None or resolve_includes:
+            return cls.loads(fp.read(), workers=workers,
+                             keep_comments=keep_comments,
+                             include_dir=include_dir)
+
+        cache_path = path + ".bdcache"
+        stat = os.stat(path)
+        source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                  "keep_comments": keep_comments}
+        try:
+            cached_meta = read_binary_meta(cache_path)
+            cached_source = dict(cached_meta["user"]["source"])
+            cached_hash = cached_source.pop("hash")
+        except (OSError, ValueError, KeyError, TypeError,
+                BinaryFormatError):
+            cached_source = cached_hash = None
+
+        deck_str = fp.read()
+        # the file is only hashed if its size and mtime are unchanged,
+        # otherwise the hash is stored with the new snapshot
+        if cached_source == source:
+            source["hash"] = text_hash(deck_str)
+            if source["hash"] == cached_hash:
+                try:
+                    return cls.load_binary(cache_path)
+                except (OSError, ValueError, KeyError, BinaryFormatError):
+                    pass
+
+        deck = cls.loads(deck_str, workers=workers,
+                         keep_comments=keep_comments)
+        if "hash" not in source:
+            source["hash"] = text_hash(deck_str)
+        try:
+            deck.save_binary(cache_path, meta={"source": source})
+        except OSError:
+            # e.g. a read-only directory, the deck is still loaded
+            pass
+        return deck
+
+    def save_binary(self, path, meta=None):
+        """Save a binary snapshot of the deck, which
+        :meth:`~bulkdata.deck.Deck.load_binary` loads much faster
+        than parsing the bulk data. The snapshot stores the header,
+        the card names and comments, and the raw field strings, see
+        :mod:`~bulkdata.binary`.
+
+        :param path: The binary file path
+        :param meta: A dict of extra JSON serializable metadata,
+                     defaults to ``None``
+        """
+        write_binary(path, self.header, self._cards, meta=meta,
+                     trailing_comment=self.trailing_comment)
+
+    @classmethod
+    def load_binary(cls, path):
+        """Load :class:`~bulkdata.deck.Deck` object from a binary
+        snapshot saved by :meth:`~bulkdata.deck.Deck.save_binary`.
+
+        :param path: The binary file path
+        :return: The loaded :class:`~bulkdata.deck.Deck` object
+        """
+        header, cards, meta = read_binary(path)
+        return cls(cards, header, meta["trailing_comment"])
+
+    @classmethod
+    def load_many(cls, paths, workers=None, executor="process",
+                  keep_comments=False, resolve_includes=False):
+        """Load :class:`~bulkdata.deck.Deck` objects from many bulk
+        data files at once. The files are parsed in a pool of workers,
+        which send back the parsed ``(name, fields)`` tuples rather
+        than cards, as they are much cheaper to pickle.
+
+        :param paths: The sequence of bulk data file paths
+        :param workers: The number of workers, defaults to ``None``,
+                        which is the number of processors
+        :param executor: The kind of workers, can be one of:
+                         ["process", "thread"], defaults to "process"
+        :param keep_comments: If ``True``, keep comment lines, see
+                              :meth:`~bulkdata.deck.Deck.loads`,
+                              defaults to ``False``
+        :param resolve_includes: If ``True``, resolve ``INCLUDE``
+                                 statements, see
+                                 :meth:`~bulkdata.deck.Deck.load`,
+                                 defaults to ``False``
+        :return: The list of loaded :class:`~bulkdata.deck.Deck`
+                 objects, in the order of *paths*
+        """
+        paths = list(paths)
+        decks = [None] * len(paths)
+        for i, deck in cls._iter_load_many(paths, workers, executor,
+                                           keep_comments, resolve_includes):
+            decks[i] = deck
+        return decks
+
+    @classmethod
+    def load_many_as_completed(cls, paths, workers=None, executor="process",
+                               keep_comments=False, resolve_includes=False):
+        """Iterate ``(path, deck)`` tuples of the bulk data files in
+        *paths*, in the order they finish loading. See
+        :meth:`~bulkdata.deck.Deck.load_many` for the parameters.
+        """
+        paths = list(paths)
+        for i, deck in cls._iter_load_many(paths, workers, executor,
+                                           keep_comments, resolve_includes):
+            yield paths[i], deck
+
+    @classmethod
+    def _iter_load_many(cls, paths, workers, executor, keep_comments,
+                        resolve_includes):
+        try:
+            executor_cls = _executors[executor]
+        except KeyError:
+            raise ValueError("executor must be one of {}, not {!r}"
+                             .format(list(_executors), executor))
+        with executor_cls(workers) as pool:
+            futures = {
+                pool.submit(_parse_file, path, keep_comments,
+                            resolve_includes): i
+                for i, path in enumerate(paths)
+            }
+            for future in as_completed(futures):
+                yield futures[future], cls._from_card_tuples(*future.result())
+
+    @classmethod
+    def load_mmap(cls, path, encoding="utf-8", keep_comments=False):
+        """Load :class:`~bulkdata.deck.Deck` object from the bulk data
+        file at *path* through a read-only memory map. The file is
+        parsed line by line straight from the mapping, so neither the
+        decoded file contents nor a list of all its lines is ever held
+        in memory.
+
+        :param path: The bulk data file path
+        :param encoding: The file encoding, defaults to "utf-8"
+        :param keep_comments: If ``True``, keep comment lines, see
+                              :meth:`~bulkdata.deck.Deck.loads`,
+                              defaults to ``False``
+        :return: The loaded :class:`~bulkdata.deck.Deck` object
+        """
+        parser = BDFParser(keep_comments=keep_comments)
+        lines = iter_mmap_lines(path, encoding)
+        cards = list(cls._iter_file_cards(parser, lines))
+        return cls(cards, parser.header, parser.trailing_comment)
+
+    @classmethod
+    def _iter_file_cards(cls, parser, fp):
+        comments = parser.comments
+        for i, (name, fields) in enumerate(parser.iter_file(fp)):
+            yield cls._load_card(name, fields, comments.pop(i, ""))
+
+    @classmethod
+    def iterload(cls, fp, keep_comments=False):
+        """Iterate the cards of a bulk data file object, reading
+        it line by line. Unlike :meth:`~bulkdata.deck.Deck.load`,
+        the file is never read into memory as a whole: each
+        :class:`~bulkdata.card.Card` is yielded as soon as its
+        continuation lines have been read.
+
+        .. code-block:: python
+
+            with open("model.bdf") as bdf_file:
+                for card in Deck.iterload(bdf_file):
+                    if card.name == "GRID":
+                        print(card[0])
+
+        :param fp: The bulk data file object
+        :param keep_comments: If ``True``, keep comment lines, see
+                              :meth:`~bulkdata.deck.Deck.loads`,
+                              defaults to ``False``
+        :return: A generator object iterating through the cards
+                 in the file. The header is not yielded.
+        """
+        parser = BDFParser(keep_comments=keep_comments)
+        return cls._iter_file_cards(parser, fp)
+
+    @classmethod
+    async def aload(cls, fp, keep_comments=False, batch_size=10000,
+                    executor=None):
+        """Load :class:`~bulkdata.deck.Deck` object from a bulk data
+        file object without blocking the event loop. The file is read
+        in batches of lines in the event loop's default executor, and
+        each batch is parsed in *executor*. The coroutine yields to
+        the event loop between batches.
+
+        .. code-block:: python
+
+            with open("model.bdf") as bdf_file:
+                deck = await Deck.aload(bdf_file)
+
+        With a :class:`~concurrent.futures.ProcessPoolExecutor`, the
+        parsing does not hold the GIL of the event loop's process:
+
+        .. code-block:: python
+
+            with ProcessPoolExecutor() as executor:
+                with open("model.bdf") as bdf_file:
+                    deck = await Deck.aload(bdf_file, executor=executor)
+
+        :param fp: The bulk data file object
+        :param keep_comments: If ``True``, keep comment lines, see
+                              :meth:`~bulkdata.deck.Deck.loads`,
+                              defaults to ``False``
+        :param batch_size: The number of lines read per batch,
+                           defaults to 10000
+        :param executor: The :class:`concurrent.futures.Executor` to
+                         parse in, defaults to ``None``, which is the
+                         event loop's default executor
         :return: The loaded :class:`~bulkdata.deck.Deck` object
         """
-        return cls.loads(fp.read())
+        loop = asyncio.get_event_loop()
+        parser = BDFParser(keep_comments=keep_comments)
+        lines = parser.read_lines(fp)
+        if not keep_comments:
+            lines = (line for line in lines if not parser.is_comment(line))
+
+        def read_batch():
+            return list(islice(lines, batch_size))
+
+        # the header is found as in BDFParser.iter_file
+        header = None
+        header_lines = []
+        pending = []
+        while header is None:
+            batch = await loop.run_in_executor(None, read_batch)
+            if not batch:
+                # no BEGIN BULK, every line is bulk data
+                header = ""
+                pending = header_lines
+                break
+            for j, line in enumerate(batch):
+                if parser.BEGINBULK in line and not parser.is_comment(line):
+                    header = "\n".join(header_lines)
+                    pending = batch[j + 1:]
+                    break
+                header_lines.append(line)
+
+        cards = []
+        trailing_comment = ""
+        eof = False
+        while not eof:
+            batch = await loop.run_in_executor(None, read_batch)
+            pending.extend(batch)
+            if batch:
+                # only whole cards are parsed, the rest waits for the
+                # next batch
+                split = parser.find_split(pending)
+                if not split:
+                    continue
+                chunk, pending = pending[:split], pending[split:]
+            else:
+                eof = True
+                chunk, pending = pending, []
+            if chunk:
+                chunk_cards, trailing_comment = await loop.run_in_executor(
+                    executor, _load_cards, chunk, keep_comments)
+                cards.extend(chunk_cards)
+        return cls(cards, header, trailing_comment)
+
+    async def adump(self, fp, format="fixed", batch_size=10000,
+                    executor=None):
+        """Dump the deck to a bulk data file without blocking the
+        event loop. Batches of cards are formatted in *executor*,
+        and written in the event loop's default executor. The
+        coroutine yields to the event loop between batches. The deck
+        should not be changed until it completes.
+
+        :param fp: The bulk data file object
+        :param format: The desired format, can be one of:
+                       ["free", "fixed", "large"], defaults to "fixed"
+        :param batch_size: The number of cards formatted per batch,
+                           defaults to 10000
+        :param executor: The :class:`concurrent.futures.Executor` to
+                         format in, defaults to ``None``, which is
+                         the event loop's default executor. With a
+                         :class:`~concurrent.futures.ProcessPoolExecutor`
+                         the cards are pickled to the workers.
+        :return: The number of characters written
+        """
+        loop = asyncio.get_event_loop()
+        cards = self._cards
+        chunks = []
+        if self.header:
+            chunks.append(self.header + "\nBEGIN BULK\n")
+        numchars = 0
+        for start in range(0, len(cards), batch_size):
+            chunks.append(await loop.run_in_executor(
+                executor, _dumps_cards, cards[start:start + batch_size],
+                format))
+            chunk = "".join(chunks)
+            chunks = []
+            await loop.run_in_executor(None, fp.write, chunk)
+            numchars += len(chunk)
+        if self.trailing_comment:
+            chunks.append(self.trailing_comment + "\n")
+        if self.header:
+            chunks.append("ENDDATA")
+        if chunks:
+            chunk = "".join(chunks)
+            await loop.run_in_executor(None, fp.write, chunk)
+            numchars += len(chunk)
+        return numchars
+
+    def _iter_dumps(self, format, buffer_size, workers=None, cache=False):
+        """Iterate the bulk data string in chunks of at least
+        *buffer_size* characters, apart from the last one.
+        """
+        if self.header:
+            yield self.header + "\nBEGIN BULK\n"
+        if workers and workers > 1:
+            yield from self._iter_dumps_parallel(format, workers)
+        else:
+            batch = []
+            batch_size = 0
+            for card in self._cards:
+                card_str = card.dumps(format, cache)
+                batch.append(card_str)
+                batch_size += len(card_str)
+                if batch_size >= buffer_size:
+                    yield "".join(batch)
+                    batch = []
+                    batch_size = 0
+            if batch:
+                yield "".join(batch)
+        if self.trailing_comment:
+            yield self.trailing_comment + "\n"
+        if self.header:
+            yield "ENDDATA"
 
-    def dumps(self, format="fixed"):
+    def _iter_dumps_parallel(self, format, workers):
+        """Iterate the bulk data strings of contiguous slices of cards,
+        in order, formatted in a pool of *workers* processes.
+        """
+        numcards = len(self._cards)
+        starts = range(0, numcards, _DUMP_CHUNK_SIZE)
+        # forked workers inherit the cards from the pool initializer
+        # arguments, which is much faster than pickling them over.
+        # The initializer is only available from Python 3.7
+        forked = (multiprocessing.get_start_method() == "fork"
+                  and sys.version_info >= (3, 7))
+        if forked:
+            executor = ProcessPoolExecutor(
+                workers, initializer=_init_dump_worker,
+                initargs=(self._cards,))
+        else:
+            executor = ProcessPoolExecutor(workers)
+        with executor:
+            # bound the number of slices held in memory
+            pending = deque()
+            for start in starts:
+                stop = min(start + _DUMP_CHUNK_SIZE, numcards)
+                if forked:
+                    future = executor.submit(
+                        _dumps_dump_cards, start, stop, format)
+                else:
+                    future = executor.submit(
+                        _dumps_cards, self._cards[start:stop], format)
+                pending.append(future)
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def dumps(self, format="fixed", workers=None, cache=False):
         """Dump the deck to a bulk data string.
 
         :param format: The desired format, can be one of: 
-                       ["free", "fixed"], defaults to "fixed"
+                       ["free", "fixed", "large"], defaults to "fixed"
+        :param workers: The number of processes to format the cards
+                        with, see :meth:`~bulkdata.deck.Deck.dump`,
+                        defaults to ``None`` (no parallel formatting)
+        :param cache: If ``True``, each card keeps its formatted string
+                      for the next dump, see
+                      :meth:`~bulkdata.card.Card.dumps`. Not used with
+                      *workers*, defaults to ``False``
         :return: The bulk data string
         """
-        bulk = "".join([card.dumps(format) for card in self.cards])
-        if self.header:
-            return self.header + "\nBEGIN BULK\n" + bulk + "ENDDATA"
-        else:
-            return bulk
+        return "".join(self._iter_dumps(format, 2**20, workers, cache))
 
-    def dump(self, fp, format="fixed"):
-        """Dump the deck to a bulk data file.
+    def dump(self, fp, format="fixed", buffer_size=2**20, workers=None,
+             cache=False):
+        """Dump the deck to a bulk data file. The cards are formatted
+        and written in batches, so the whole bulk data string is never
+        held in memory.
 
         :param fp: The bulk data file object
         :param format: The desired format, can be one of: 
-                       ["free", "fixed"], defaults to "fixed"
+                       ["free", "fixed", "large"], defaults to "fixed"
+        :param buffer_size: The number of characters formatted before
+                            each write, defaults to 2**20
+        :param workers: If greater than 1, contiguous slices of cards
+                        are formatted in a pool of *workers* processes
+                        and written in order, defaults to ``None``
+        :param cache: If ``True``, each card keeps its formatted string
+                      for the next dump, see
+                      :meth:`~bulkdata.card.Card.dumps`. Not used with
+                      *workers*, defaults to ``False``
+        :return: The number of characters written
         """
-        return fp.write(self.dumps(format=format))
+        numchars = 0
+        chunks = self._iter_dumps(format, buffer_size, workers, cache)
+        for chunk in chunks:
+            fp.write(chunk)
+            numchars += len(chunk)
+        return numchars
 
     def sorted(self, key=None, reverse=False):
         """Return a deck containing the sorted deck cards.
@@ -414,7 +1120,8 @@ class Deck():
         """
         key = key or (lambda card: card.name)
         cards = sorted(self._cards, key=key, reverse=reverse)
-        return Deck(cards, header=self.header)
+        return Deck(cards, header=self.header,
+                    trailing_comment=self.trailing_comment)
 
     def __str__(self):
         """Dump the deck to as a bulk data string with default
@@ -2,4 +2,12 @@ class Error(Exception):
     """Error"""
     
 class EmptyLineError(Error):
-    """EmptyLineError"""
\ No newline at end of file
+    """EmptyLineError"""
+
+
+class IncludeError(Error):
+    """IncludeError"""
+
+
+class BinaryFormatError(Error):
+    """BinaryFormatError"""
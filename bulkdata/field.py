@@ -1,3 +1,4 @@
+import functools
 import re
 
 try:
@@ -41,11 +42,11 @@ def _is_match(rx, field):
 
 
 def is_integer_field(field):
-    return _is_match(rx_INT, field)
+    return _scan_number(field.strip())[0] is _INTEGER
 
 
 def is_real_field(field):
-    return _is_match(rx_REAL, field)
+    return _scan_number(field.strip())[0] is not None
 
 
 def read_integer_field(field):
@@ -56,24 +57,83 @@ def read_real_field(field):
     return float(_force_E(field))
 
 
+_INTEGER = 1
+_REAL = 2
+
+_NUMBER_START = frozenset("+-.0123456789")
+_NONZERO_DIGITS = frozenset("123456789")
+
+
+def _scan_number(field):
+    """Classify the stripped `field` string as an integer or real,
+    accepting exactly what `rx_INT` and `rx_REAL` match. Return
+    ``(kind, exponent_i)``, where `kind` is ``None`` if `field` is not
+    a number and `exponent_i` is the index of an exponent sign not
+    preceded by ``E``, if any.
+    """
+    if not field:
+        return None, None
+    first = field[0]
+    if first not in _NUMBER_START and not first.isdecimal():
+        return None, None
+
+    start = 1 if first in "+-" else 0
+    digits = field[start:]
+    if digits.isdecimal():
+        if digits[0] in _NONZERO_DIGITS or digits == "0":
+            return _INTEGER, None
+        return _REAL, None
+
+    # the exponent starts at the first of "Ee+-" after the sign
+    exponent_i = len(field)
+    for char in "Ee+-":
+        i = field.find(char, start)
+        if 0 <= i < exponent_i:
+            exponent_i = i
+
+    # mantissa has at least one digit and at most one "."
+    whole, dot, fraction = field[start:exponent_i].partition(".")
+    if not (whole or fraction):
+        return None, None
+    if whole and not whole.isdecimal():
+        return None, None
+    if fraction and not fraction.isdecimal():
+        return None, None
+
+    exponent = field[exponent_i:]
+    if not exponent:
+        return _REAL, None
+    if exponent[0] in "Ee":
+        exponent = exponent[1:]
+        sign_i = None
+    else:
+        sign_i = exponent_i
+    if exponent and exponent[0] in "+-":
+        exponent = exponent[1:]
+    if exponent.isdecimal():
+        return _REAL, sign_i
+    return None, None
+
+
 def read_field(field):
     """Convert `field` string to value
     """
-    if is_integer_field(field):
-        return read_integer_field(field)
-    if is_real_field(field):
-        return read_real_field(field)
+    field = field.strip()
+    kind, exponent_i = _scan_number(field)
+    if kind is _INTEGER:
+        return int(field)
+    elif kind is _REAL:
+        if exponent_i is not None:
+            # Nastran exponent without "E", e.g. 1.-3
+            field = field[:exponent_i] + "E" + field[exponent_i:]
+        return float(field)
     else:
-        return field.strip()
+        return field
     
 
-def write_field(value, fieldspan=1):
-    """Convert `value` to field string
-    """
+def _write_number(value, fieldspan):
     width = fieldspan * 8
-    if isinstance(value, str):
-        return value[:width].strip()
-    elif width == 8:
+    if width == 8:
         return print_field_8(value).strip()
     elif width == 16:
         return print_field_16(value).strip()
@@ -83,11 +143,65 @@ def write_field(value, fieldspan=1):
                          "but fieldspan is {}".format(fieldspan))
 
 
+_cached_write_number = functools.lru_cache(maxsize=65536, typed=True)(
+    _write_number)
+
+
+def set_write_field_cache_size(maxsize):
+    """Set the number of values whose field strings are kept by
+    `write_field`, clearing the cache. 0 disables the cache and
+    ``None`` lets it grow without bound.
+    """
+    global _cached_write_number
+    _cached_write_number = functools.lru_cache(maxsize=maxsize, typed=True)(
+        _write_number)
+
+
+def write_field_cache_info():
+    """Get the hits, misses, maxsize and currsize statistics of the
+    `write_field` cache.
+    """
+    return _cached_write_number.cache_info()
+
+
+def write_field_cache_clear():
+    """Clear the `write_field` cache and its statistics.
+    """
+    _cached_write_number.cache_clear()
+
+
+def write_field(value, fieldspan=1):
+    """Convert `value` to field string. The field strings of
+    non-string values are cached by type, value and `fieldspan`.
+    """
+    if isinstance(value, str):
+        return value[:fieldspan * 8].strip()
+    try:
+        return _cached_write_number(value, fieldspan)
+    except TypeError:
+        # unhashable value
+        return _write_number(value, fieldspan)
+
+
 class Field:
+
+    __slots__ = ("span", "_raw", "_value", "_value_change")
     
     def __init__(self, value, fieldspan=1):
         self.span = fieldspan
-        self.value = value
+        self._raw = write_field(value, fieldspan)
+        self._value_change = True
+
+    @classmethod
+    def from_raw(cls, raw, fieldspan=1):
+        """Create a field from its *raw* field string, without converting
+        it. The value is parsed from *raw* on first access.
+        """
+        field = cls.__new__(cls)
+        field.span = fieldspan
+        field._raw = raw
+        field._value_change = True
+        return field
 
     @property
     def width(self):
@@ -113,19 +227,31 @@ class Field:
     def __bool__(self):
         return not self.is_blank()
     
+    @property
+    def raw(self):
+        return self._raw
+
+    @raw.setter
+    def raw(self, new_raw):
+        self._raw = new_raw
+        # parse the value again on next access
+        self._value_change = True
+
     @property
     def value(self):
         if self._value_change:
-            self._value = read_field(self.raw)
+            self._value = read_field(self._raw)
+            self._value_change = False
         return self._value
     
     @value.setter
     def value(self, new_value):
         self.raw = write_field(new_value, fieldspan=self.span)
-        self._value_change = True
         
     
 class LargeField(Field):
+
+    __slots__ = ()
     
     def __init__(self, value, fieldspan=2):
         super().__init__(value, fieldspan)
@@ -137,10 +263,30 @@ class LargeField(Field):
         fields = []
         for start in range(0, len(self.raw), fieldwidth):
             stop = start + fieldwidth
-            fields.append(Field(self.raw[start:stop], fieldspan))
+            fields.append(SplitField(self.raw[start:stop], fieldspan,
+                                     start // fieldwidth + 1))
         return fields
 
     @classmethod
     def join(cls, fields):
         large_str = "".join([field.raw for field in fields])
-        return cls(large_str, fieldspan=len(fields))
\ No newline at end of file
+        return cls(large_str, fieldspan=len(fields))
+
+
+class SplitField(Field):
+    """A field cell holding a part of a value split by
+    :meth:`LargeField.split`, *part* is its 1-based position in
+    the split value.
+    """
+
+    __slots__ = ("part",)
+
+    def __init__(self, value, fieldspan=1, part=1):
+        super().__init__(value, fieldspan)
+        self.part = part
+
+    @classmethod
+    def from_raw(cls, raw, fieldspan=1, part=1):
+        field = super().from_raw(raw, fieldspan)
+        field.part = part
+        return field
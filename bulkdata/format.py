@@ -1,4 +1,4 @@
-from .field import Field
+from .field import Field, write_field
 
 
 class BaseFormatter:
@@ -7,19 +7,28 @@ class BaseFormatter:
     delimiter = ""
     valuesperline = 8 # fields with value, per line
     fieldwidth = 8
+    continuationmark = "+"
 
     def format_field(self, field):
         if isinstance(field, Field):
-            field = field.raw
-        else:
-            field = field
+            raw = field.raw
+            if len(raw) > self.fieldwidth:
+                # numbers from wider fields are written again to fit
+                value = field.value
+                if not isinstance(value, str):
+                    raw = write_field(value, self.fieldwidth // 8)
+            field = raw
         return field[:self.fieldwidth]
+
+    def format_head(self, head):
+        return self.format_field(head)
+
+    def format_name(self, name):
+        return self.format_head(name or " ")
         
     def continuation(self, index=""):
-        label = "+" + str(index)
-        beg = self.format_field(label)
-        end = self.format_field(label)
-        return beg + self.newline + end
+        label = self.format_head(self.continuationmark + str(index))
+        return label + self.newline + label
 
     def endofline(self, index):
         valuesperline = self.valuesperline
@@ -31,54 +40,91 @@ class BaseFormatter:
         else:
             return False
 
+    def card_fields(self, card):
+        return card.fields
+
     def remove_trailing_blanks(self, fields):
-        fields = list(fields)
-        for i in reversed(range(len(fields))):
-            if not fields[i]:
-                del fields[i]
-            else:
-                break
-        return fields
+        end = len(fields)
+        while end and not fields[end - 1]:
+            end -= 1
+        return list(fields[:end])
 
     def format_card(self, card):
-        
-        card_str = ""
-        line_pos = 0   # position in the line
-        line_count = 0 # line counter
-        
-        def concat_field(field, last_field=False):
-            nonlocal card_str, line_pos, line_count
-
-            card_str += self.format_field(field or " ")
-            card_str += self.delimiter
-            line_pos += 1
-            
-            # if end-of-line is reached, concat continuation
-            if self.endofline(line_pos) and not last_field:
-                card_str += self.continuation(line_count)
-                card_str += self.delimiter
-                line_pos = 0
-                line_count += 1
-
-        fields = self.remove_trailing_blanks(card.fields)
-        card_str += self.format_field(card.name or " ")
+
+        format_field = self.format_field
+        delimiter = self.delimiter
+        valuesperline = self.valuesperline
+
+        fields = self.remove_trailing_blanks(self.card_fields(card))
+        parts = [self.format_name(card.name)]
 
         if len(fields) > 0:
-            card_str += self.delimiter
+            parts.append(delimiter)
 
-            for field in fields[:-1]:
-                concat_field(field)
-            
-            concat_field(fields[-1], last_field=True)
-        
-        return card_str.rstrip(" " + self.delimiter) + self.newline
+            for i, field in enumerate(fields):
+                # if end-of-line is reached, add continuation
+                if i and valuesperline and not i % valuesperline:
+                    parts.append(self.continuation(i // valuesperline - 1))
+                    parts.append(delimiter)
+                parts.append(format_field(field or " "))
+                parts.append(delimiter)
+
+        card_str = "".join(parts)
+        return card_str.rstrip(" " + delimiter) + self.newline
 
 
 class FixedFormatter(BaseFormatter):
 
     def format_field(self, field):
         field = super().format_field(field)
-        return "{:<{}}".format(field, self.fieldwidth)
+        return field.ljust(self.fieldwidth)
+
+
+class LargeFormatter(FixedFormatter):
+
+    valuesperline = 4
+    fieldwidth = 16
+    headwidth = 8
+    continuationmark = "*"
+
+    def format_head(self, head):
+        return head[:self.headwidth].ljust(self.headwidth)
+
+    # cards whose name leaves no room for the large field mark
+    smallformatter = FixedFormatter()
+
+    def format_name(self, name):
+        return self.format_head((name or " ") + self.continuationmark)
+
+    def format_card(self, card):
+        """Format *card* in large fields, or in small fields if its
+        name is too long to be followed by the large field mark,
+        e.g. BCTPARAM.
+        """
+        if card.name and len(card.name) >= self.headwidth:
+            return self.smallformatter.format_card(card)
+        return super().format_card(card)
+
+    def card_fields(self, card):
+        """Join each pair of cells of a value split in 8 character
+        cells, e.g. by ``Card.append(value, fieldspan=2)``, back into
+        a single 16 character field.
+        """
+        fields = card.fields
+        joined = []
+        i = 0
+        numfields = len(fields)
+        while i < numfields:
+            field = fields[i]
+            part = getattr(field, "part", 0)
+            if (part % 2 and i + 1 < numfields
+                    and getattr(fields[i + 1], "part", 0) == part + 1):
+                joined.append(Field.from_raw(field.raw + fields[i + 1].raw, 2))
+                i += 2
+            else:
+                joined.append(field)
+                i += 1
+        return joined
 
 
 class FreeFormatter(BaseFormatter):
@@ -88,7 +134,8 @@ class FreeFormatter(BaseFormatter):
 
 _formatters = {
     "fixed": FixedFormatter(),
-    "free": FreeFormatter()
+    "free": FreeFormatter(),
+    "large": LargeFormatter()
 }
 
 _defaultformat = "fixed"
@@ -1,22 +1,114 @@
-from .error import EmptyLineError
+import mmap
+import os
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .error import EmptyLineError, IncludeError
+
+
+def _parse_chunk(lines, keep_comments, include_dir=None):
+    parser = BDFParser(keep_comments=keep_comments, include_dir=include_dir)
+    cards = list(parser.iter_cards(lines))
+    return cards, parser.comments, parser.trailing_comment
+
+
+# parsed include files, keyed by path and keep_comments, least
+# recently used first
+_include_cache = OrderedDict()
+
+# maximum number of cards of the parsed include files in the cache
+_include_cache_maxcards = 1000000
+
+IncludeFile = namedtuple(
+    "IncludeFile", ["stamps", "cards", "comments", "trailing_comment"])
+
+
+def _stat_stamp(path):
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def clear_include_cache():
+    """Clear the cache of parsed include files, see
+    :meth:`BDFParser.parse_include_file`.
+    """
+    _include_cache.clear()
+
+
+def set_include_cache_size(maxcards):
+    """Set the number of cards of parsed include files kept in the
+    cache, clearing it. The least recently used files are dropped
+    first. 0 disables the cache and ``None`` lets it grow without
+    bound. Defaults to 1000000 cards.
+    """
+    global _include_cache_maxcards
+    _include_cache_maxcards = maxcards
+    _include_cache.clear()
+
+
+def _cache_include(key, include):
+    maxcards = _include_cache_maxcards
+    _include_cache[key] = include
+    if maxcards is None:
+        return
+    numcards = sum(len(cached.cards) for cached in _include_cache.values())
+    while _include_cache and numcards > maxcards:
+        _, dropped = _include_cache.popitem(last=False)
+        numcards -= len(dropped.cards)
+
+
+def iter_mmap_lines(path, encoding="utf-8"):
+    """Iterate the decoded lines of the file at *path* through a
+    read-only memory map. Lines are sliced from the mapping and decoded
+    one at a time, so the file contents are never copied into memory
+    as a whole.
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            return
+        with mm:
+            for line in iter(mm.readline, b""):
+                yield line.decode(encoding)
 
 
 class BDFParser:
     
     BEGINBULK = "BEGIN BULK"
     ENDDATA = "ENDDATA"
+    INCLUDE = "INCLUDE"
     MAXLINELENGTH = 80
     FIELDWIDTH = 8
     FIELDSPERLINE = 10
     FIELDSPERBODY = 8
+    LARGEMARK = "*"
+    LARGEFIELDWIDTH = 16
+    LARGEFIELDSPERLINE = 6
+    LARGEFIELDSPERBODY = 4
     
-    def __init__(self, bdf_str):
+    def __init__(self, bdf_str="", keep_comments=False, include_dir=None):
         # bdf_str = self.expand_tabs(bdf_str)
+        self.keep_comments = keep_comments
+        # INCLUDE statements in the bulk data are resolved relative
+        # to include_dir, if set
+        self.include_dir = include_dir
+        # paths of the include files being parsed, outermost first
+        self._including = ()
         self.bds = self.ignore_enddata(bdf_str)
         self.lines = self.bds.split("\n")
-        self.remove_comments()
+        if not keep_comments:
+            self.remove_comments()
         self.line_idx = 0
         self.cards = []
+        self.header = ""
+        # comment lines preceding each card, keyed by card index
+        self.comments = {}
+        self.trailing_comment = ""
+        self.numcards = 0
+        # (path, mtime, size) of the files included by the bulk data
+        self.include_stamps = []
         
     def current_line(self):
         return self.lines[self.line_idx]
@@ -39,19 +131,14 @@ class BDFParser:
         return not line or line[0] == "$"
         
     def remove_comments(self):
-        comments_i = [
-            i 
-            for i in range(len(self.lines))
-            if self.is_comment(self.lines[i])
-        ]
-        for i in reversed(comments_i):
-            del self.lines[i]
+        is_comment = self.is_comment
+        self.lines = [line for line in self.lines if not is_comment(line)]
 
     def parse_header(self):
 
         beginbulk_i = None
         for line_idx, line in enumerate(self.lines):
-            if self.BEGINBULK in line:
+            if self.BEGINBULK in line and not self.is_comment(line):
                 beginbulk_i = line_idx
                 break
 
@@ -61,12 +148,42 @@ class BDFParser:
             self.line_idx = beginbulk_i + 1
             return "\n".join(self.lines[:beginbulk_i])
     
+    def is_card_start(self, head):
+        head = head.strip()
+        return (bool(head) and "+" not in head
+                and not head.startswith(self.LARGEMARK))
+
+    def is_head_large(self, head):
+        return self.LARGEMARK in head
+
+    def parse_name(self, head):
+        """Get the card name from the *head* of its first line. Large
+        field card names end with the large field marker.
+        """
+        return head.strip()
+
+    def mark_large(self, name):
+        if name.endswith(self.LARGEMARK):
+            return name
+        return name + self.LARGEMARK
+
+    def remove_trailing_blanks(self, fields):
+        numfields = len(fields)
+        while numfields and not fields[numfields - 1].strip():
+            numfields -= 1
+        del fields[numfields:]
+        return fields
+
     def is_line_free(self, line):
         return "," in line
     
-    def parse_fields(self, fields):
-        fieldsperline = self.FIELDSPERLINE
-        fieldsperbody = self.FIELDSPERBODY
+    def parse_fields(self, fields, large=False):
+        if large:
+            fieldsperline = self.LARGEFIELDSPERLINE
+            fieldsperbody = self.LARGEFIELDSPERBODY
+        else:
+            fieldsperline = self.FIELDSPERLINE
+            fieldsperbody = self.FIELDSPERBODY
         numfields = len(fields)
         head, body, tail = None, [], None
         if numfields == 0:
@@ -85,14 +202,28 @@ class BDFParser:
     
     def parse_line_free(self, line):
         fields = line.rstrip(",").split(",")
-        return self.parse_fields(fields)
+        return self.parse_fields(fields, self.is_head_large(fields[0]))
     
     def parse_line_fixed(self, line):
         fieldwidth = self.FIELDWIDTH
         length = len(line)
+        if self.is_head_large(line[:fieldwidth]):
+            return self.parse_line_large(line)
         fields = [line[i:i+fieldwidth]
                   for i in range(0, length, fieldwidth)]
         return self.parse_fields(fields)
+
+    def parse_line_large(self, line):
+        fieldwidth = self.FIELDWIDTH
+        largefieldwidth = self.LARGEFIELDWIDTH
+        tail_i = fieldwidth + largefieldwidth * self.LARGEFIELDSPERBODY
+        fields = [line[:fieldwidth]]
+        fields.extend([line[i:i+largefieldwidth]
+                       for i in range(fieldwidth, min(len(line), tail_i),
+                                      largefieldwidth)])
+        if len(line) > tail_i:
+            fields.append(line[tail_i:tail_i+fieldwidth])
+        return self.parse_fields(fields, large=True)
     
     def parse_line(self, line):
         
@@ -105,7 +236,8 @@ class BDFParser:
     def parse_card(self):
         
         line = self.current_line()
-        name, fields, tail = self.parse_line(line)
+        head, fields, tail = self.parse_line(line)
+        name = self.parse_name(head)
         
         while True:
             
@@ -116,35 +248,276 @@ class BDFParser:
 
             next_head, next_fields, next_tail = self.parse_line(next_line)
             
-            if not tail:
-                next_head = next_head.strip()
-                if next_head and not ("+" in next_head):
-                    break
+            if not tail and self.is_card_start(next_head):
+                break
 
             tail = next_tail
             fields.extend(next_fields)
+            if self.is_head_large(next_head):
+                name = self.mark_large(name)
 
-        # pop trailing blank fields
-        for i in reversed(range(len(fields))):
-            if not fields[i].strip():
-                del fields[i]
-            else:
-                break
-
-        return name, fields
+        return name, self.remove_trailing_blanks(fields)
             
     def endofbdf(self):
         return self.line_idx == len(self.lines)
         
-    def parse(self):
+    def is_card_boundary(self, prev_line, line):
+        if self.is_comment(prev_line) or self.is_comment(line):
+            return False
+        _, _, prev_tail = self.parse_line(prev_line)
+        head, _, _ = self.parse_line(line)
+        return not prev_tail and self.is_card_start(head)
+
+    def split_chunks(self, lines, numchunks):
+        """Split *lines* into at most *numchunks* chunks of about equal
+        size, only splitting at lines that start a new card.
+        """
+        numlines = len(lines)
+        chunksize = max(numlines // numchunks, 1)
+        chunks = []
+        start = 0
+        while start < numlines:
+            stop = start + chunksize
+            is_card_boundary = self.is_card_boundary
+            while (stop < numlines
+                   and not is_card_boundary(lines[stop - 1], lines[stop])):
+                stop += 1
+            chunks.append(lines[start:stop])
+            start = stop
+        return chunks
+
+    def find_split(self, lines):
+        """Get the index at which *lines* may be split into two chunks
+        parsed separately: the start of the last card whose previous
+        card is complete, moved back over the comment lines preceding
+        the card. 0 if there is no such index.
+        """
+        j = len(lines) - 1
+        while j > 0:
+            line = lines[j]
+            if not self.is_comment(line) and self.is_card_start(
+                    self.parse_line(line)[0]):
+                k = j - 1
+                while k >= 0 and self.is_comment(lines[k]):
+                    k -= 1
+                if k < 0:
+                    return 0
+                _, _, tail = self.parse_line(lines[k])
+                if not tail:
+                    return k + 1
+                j = k
+            else:
+                j -= 1
+        return 0
+
+    def parse(self, workers=None):
+        """Parse the header and cards.
         
+        :param workers: If greater than 1, the bulk data lines are split
+                        into chunks at card boundaries and parsed in a
+                        pool of *workers* processes, defaults to ``None``
+        :return: The header and a list of ``(name, fields)`` tuples
+        """
         header = self.parse_header()
-        
-        cards = []
-        
-        while not self.endofbdf():
-            
-            card = self.parse_card()
-            cards.append(card)
-            
-        return header, cards
\ No newline at end of file
+        self.header = header
+        lines = self.lines[self.line_idx:]
+        self.line_idx = len(self.lines)
+
+        if workers and workers > 1:
+            chunks = self.split_chunks(lines, workers)
+            keep_comments = [self.keep_comments] * len(chunks)
+            include_dirs = [self.include_dir] * len(chunks)
+            cards = []
+            with ProcessPoolExecutor(workers) as executor:
+                results = executor.map(_parse_chunk, chunks, keep_comments,
+                                       include_dirs)
+                for chunk_cards, chunk_comments, chunk_trailing in results:
+                    # comments trailing the previous chunk precede
+                    # the first card of this chunk
+                    if self.trailing_comment and chunk_cards:
+                        comment_lines = [self.trailing_comment]
+                        if 0 in chunk_comments:
+                            comment_lines.append(chunk_comments[0])
+                        chunk_comments[0] = "\n".join(comment_lines)
+                        self.trailing_comment = ""
+                    for i, comment in chunk_comments.items():
+                        self.comments[len(cards) + i] = comment
+                    if chunk_trailing:
+                        self.trailing_comment = chunk_trailing
+                    cards.extend(chunk_cards)
+            self.numcards = len(cards)
+        else:
+            cards = list(self.iter_cards(lines))
+
+        return header, cards
+
+    def read_lines(self, fp):
+        """Iterate the lines of file object *fp*, or any iterable of
+        lines, without line endings, stopping at ``ENDDATA``.
+        """
+        enddata = self.ENDDATA
+        for line in fp:
+            enddata_i = line.find(enddata)
+            if enddata_i >= 0:
+                yield line[:enddata_i]
+                return
+            yield line.rstrip("\r\n")
+
+    def is_include(self, line):
+        return line[:7].upper() == self.INCLUDE
+
+    def parse_include(self, line, lines):
+        """Get the path of the ``INCLUDE`` statement on *line*. Quoted
+        paths may continue on the next lines of the *lines* iterator.
+        """
+        path = line.strip()[len(self.INCLUDE):].strip()
+        if not path.startswith("'"):
+            return path
+        path = path[1:]
+        while "'" not in path:
+            try:
+                path += next(lines).strip()
+            except StopIteration:
+                raise IncludeError("unterminated INCLUDE path: "
+                                   "{!r}".format(path))
+        return path[:path.index("'")]
+
+    def parse_include_file(self, path):
+        """Parse the bulk data file included at *path*, relative to
+        :attr:`include_dir`, and its own includes. The parsed cards
+        are cached by path, and reused until the file or one of its
+        includes is modified, see :func:`set_include_cache_size`.
+        The cached field lists must not be modified.
+
+        :return: The :class:`IncludeFile` tuple
+        """
+        path = os.path.abspath(os.path.join(self.include_dir,
+                                            os.path.expanduser(path)))
+        if path in self._including:
+            raise IncludeError("recursive INCLUDE of {!r}".format(path))
+
+        key = (path, self.keep_comments)
+        include = _include_cache.get(key)
+        if include is not None and all(_stat_stamp(stamp[0]) == stamp
+                                       for stamp in include.stamps):
+            _include_cache.move_to_end(key)
+            return include
+
+        stamp = _stat_stamp(path)
+        parser = BDFParser(keep_comments=self.keep_comments,
+                           include_dir=os.path.dirname(path))
+        parser._including = self._including + (path,)
+        with open(path) as fp:
+            lines = parser.read_lines(fp)
+            if not self.keep_comments:
+                lines = (line for line in lines if not self.is_comment(line))
+            cards = list(parser.iter_cards(lines))
+        include = IncludeFile([stamp] + parser.include_stamps, cards,
+                              parser.comments, parser.trailing_comment)
+        _cache_include(key, include)
+        return include
+
+    def iter_cards(self, lines):
+        """Iterate ``(name, fields)`` tuples of the cards in *lines*,
+        an iterable of bulk data lines. Each card is yielded as soon
+        as the line following it is read, so only one card is held
+        in memory at a time.
+
+        If :attr:`keep_comments` is set, the comment lines preceding
+        each card are stored in :attr:`comments`, keyed by the card
+        index, before the card is yielded. Comments following the
+        last card are stored in :attr:`trailing_comment`.
+
+        If :attr:`include_dir` is set, the cards of ``INCLUDE``
+        statements are yielded in their place, see
+        :meth:`parse_include_file`.
+        """
+        keep_comments = self.keep_comments
+        include_dir = self.include_dir
+        comment_lines = []
+        name, fields, tail = None, None, None
+        lines = iter(lines)
+
+        for line in lines:
+
+            if keep_comments and self.is_comment(line):
+                comment_lines.append(line)
+                continue
+
+            if include_dir is not None and self.is_include(line):
+                if name is not None:
+                    self.numcards += 1
+                    yield name, self.remove_trailing_blanks(fields)
+                name, fields, tail = None, None, None
+                include = self.parse_include_file(
+                    self.parse_include(line, lines))
+                self.include_stamps.extend(include.stamps)
+                for i, (include_name, include_fields) in enumerate(
+                        include.cards):
+                    if i in include.comments:
+                        comment_lines.append(include.comments[i])
+                    if comment_lines:
+                        self.comments[self.numcards] = "\n".join(comment_lines)
+                        comment_lines = []
+                    self.numcards += 1
+                    # copy the fields, the cached ones are shared
+                    yield include_name, list(include_fields)
+                if include.trailing_comment:
+                    comment_lines.append(include.trailing_comment)
+                continue
+
+            next_head, next_fields, next_tail = self.parse_line(line)
+
+            if name is not None and (tail
+                                     or not self.is_card_start(next_head)):
+                fields.extend(next_fields)
+                if self.is_head_large(next_head):
+                    name = self.mark_large(name)
+            else:
+                if name is not None:
+                    self.numcards += 1
+                    yield name, self.remove_trailing_blanks(fields)
+                if comment_lines:
+                    self.comments[self.numcards] = "\n".join(comment_lines)
+                    comment_lines = []
+                name, fields = self.parse_name(next_head), next_fields
+
+            tail = next_tail
+
+        # blank lines before ENDDATA or the end of the file are dropped
+        self.trailing_comment = "\n".join(comment_lines).rstrip("\n")
+
+        if name is not None:
+            self.numcards += 1
+            yield name, self.remove_trailing_blanks(fields)
+
+    def iter_file(self, fp):
+        """Parse the bulk data file object *fp*, or any iterable of
+        lines, line by line,
+        iterating ``(name, fields)`` tuples of its cards. The header,
+        if any, is stored in :attr:`header` once the ``BEGIN BULK``
+        line is reached.
+
+        .. note::
+
+            Lines are buffered until ``BEGIN BULK`` is found, so
+            memory use is only bounded by the largest card once the
+            bulk data section is reached. Files without ``BEGIN BULK``
+            are buffered completely, as they are all bulk data.
+        """
+        lines = self.read_lines(fp)
+        if not self.keep_comments:
+            lines = (line for line in lines if not self.is_comment(line))
+
+        header_lines = []
+        for line in lines:
+            if self.BEGINBULK in line and not self.is_comment(line):
+                self.header = "\n".join(header_lines)
+                break
+            header_lines.append(line)
+        else:
+            # no BEGIN BULK, every line is bulk data
+            self.header = ""
+            lines = header_lines
+
+        yield from self.iter_cards(lines)
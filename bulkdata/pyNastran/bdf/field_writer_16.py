@@ -3,11 +3,12 @@ Defines functions for single precision 16 character field writing.
 """
 import sys
 from typing import List, Union, Optional, Any
+import numpy as np
 from numpy import float32, isnan  # type: ignore
 
 from ..utils.numpy_utils import integer_types
 from .cards.utils import wipe_empty_fields
-from .field_writer_8 import set_blank_if_default
+from .field_writer_8 import set_blank_if_default, print_fixed_array
 
 def set_string16_blank_if_default(value: Any, default: Any) -> str:
     """helper method for writing BDFs"""
@@ -193,6 +194,78 @@ def print_float_16(value: float) -> str:
     return field
 
 
+# (lower, upper, decimals) for values printed in fixed-point notation
+# by print_float_16, the rest take one of its special-case branches
+_FIXED_RANGES_16 = [
+    (0.001, 1., 15),
+    (1., 10., 14),
+    (10., 100., 13),
+    (100., 1000., 12),
+    (1000., 10000., 11),
+    (10000., 100000., 10),
+    (100000., 1000000., 9),
+    (1000000., 10000000., 8),
+    (10000000., 100000000., 7),
+    (100000000., 1000000000., 6),
+    (1000000000., 10000000000., 5),
+    (10000000000., 100000000000., 4),
+    (100000000000., 1000000000000., 3),
+    (1000000000000., 10000000000000., 2),
+    (10000000000000., 100000000000000., 1),
+    (-1., -0.01, 14),
+    (-10., -1., 13),
+    (-100., -10., 12),
+    (-1000., -100., 11),
+    (-10000., -1000., 10),
+    (-100000., -10000., 9),
+    (-1000000., -100000., 8),
+    (-10000000., -1000000., 7),
+    (-100000000., -10000000., 6),
+    (-1000000000., -100000000., 5),
+    (-10000000000., -1000000000., 4),
+    (-100000000000., -10000000000., 3),
+    (-1000000000000., -100000000000., 2),
+    (-10000000000000., -1000000000000., 1),
+]
+
+
+def print_float_16_array(values: np.ndarray) -> np.ndarray:
+    """
+    Prints an array of floats in nastran 16-character width syntax,
+    the same as calling print_float_16 on each value.
+    .. seealso:: print_float_8_array
+    """
+    values = np.asarray(values, dtype='float64')
+    flat = values.ravel()
+    fields = np.full(flat.shape, '                ', dtype='<U16')
+    todo = ~isnan(flat)
+
+    zero = flat == 0.0
+    fields[zero] = '              0.'
+    todo &= ~zero
+
+    for lower, upper, decimals in _FIXED_RANGES_16:
+        if lower > 0.:
+            in_range = (flat >= lower) & (flat < upper)
+        else:
+            in_range = (flat > lower) & (flat <= upper)
+        in_range &= todo
+        if not in_range.any():
+            continue
+        range_fields, ok = print_fixed_array(flat[in_range], decimals, 16)
+        in_range[in_range] = ok
+        fields[in_range] = range_fields[ok]
+        todo &= ~in_range
+
+    others = [print_float_16(value) for value in flat[todo].tolist()]
+    if others:
+        if max(len(field) for field in others) > 16:
+            fields = fields.astype(object)
+        fields[todo] = others
+
+    return fields.astype(str).reshape(values.shape)
+
+
 def print_field_16(value):
     # type: (Optional[Union[int, float, str]]) -> str
     """
@@ -1,6 +1,7 @@
 """Defines functions for single precision 8 character field writing."""
 import sys
 from typing import List, Union, Any
+import numpy as np
 from numpy import float32, isnan
 
 
@@ -196,6 +197,138 @@ def print_float_8(value: float) -> str:
     return field
 
 
+# (lower, upper, decimals) for values printed in fixed-point notation
+# by print_float_8, the rest take one of its special-case branches
+_FIXED_RANGES_8 = [
+    (0.001, 1., 7),
+    (1., 10., 6),
+    (10., 100., 5),
+    (100., 1000., 4),
+    (1000., 10000., 3),
+    (10000., 100000., 2),
+    (100000., 1000000., 1),
+    (-1., -0.01, 6),
+    (-10., -1., 5),
+    (-100., -10., 4),
+    (-1000., -100., 3),
+    (-10000., -1000., 2),
+    (-100000., -10000., 1),
+]
+
+
+def print_fixed_array(values: np.ndarray, decimals: int, width: int):
+    """
+    Prints an array of floats as '%<width>.<decimals>f' would, with
+    leading and trailing zeros stripped and '-0.' written as '-.',
+    right justified to width.
+
+    The digits are computed with integer arithmetic.  Values whose
+    rounding is too close to call in floating point, or whose field
+    does not fit in width, are flagged instead of printed.
+
+    Returns
+    -------
+    fields : ndarray
+        the width-character strings
+    ok : ndarray
+        False for the values that were not printed
+
+    """
+    negative = values < 0.
+    scaled = np.abs(values) * 10. ** decimals
+    rounded = np.rint(scaled)
+    # the product is within half a spacing of the exact value, ties
+    # closer than that need the exact decimal expansion of the value
+    ok = np.abs(scaled - np.floor(scaled) - 0.5) > 2 * np.spacing(scaled)
+    number = rounded.astype('int64')
+
+    # integer part, and fraction digits without trailing zeros
+    integer, fraction = np.divmod(number, 10 ** decimals)
+    nfraction = np.full(values.shape, decimals)
+    for _ in range(decimals):
+        trailing = (nfraction > 0) & (fraction % 10 == 0)
+        fraction[trailing] //= 10
+        nfraction[trailing] -= 1
+    ninteger = np.zeros(values.shape, dtype='int64')
+    remaining = integer.copy()
+    while remaining.any():
+        ninteger[remaining > 0] += 1
+        remaining //= 10
+    ok &= negative + ninteger + 1 + nfraction <= width
+
+    chars = np.full(values.shape + (width,), ord(' '), dtype='uint32')
+    fraction_digits = fraction
+    integer_digits = integer
+    for position in range(width):
+        column = chars[..., width - 1 - position]
+        is_fraction = position < nfraction
+        is_point = position == nfraction
+        is_integer = ((position > nfraction)
+                      & (position <= nfraction + ninteger))
+        is_sign = negative & (position == nfraction + ninteger + 1)
+        column[is_fraction] = ord('0') + fraction_digits[is_fraction] % 10
+        column[is_point] = ord('.')
+        column[is_integer] = ord('0') + integer_digits[is_integer] % 10
+        column[is_sign] = ord('-')
+        fraction_digits = np.where(is_fraction, fraction_digits // 10,
+                                   fraction_digits)
+        integer_digits = np.where(is_integer, integer_digits // 10,
+                                  integer_digits)
+    fields = chars.view('<U%d' % width).reshape(values.shape)
+    return fields, ok
+
+
+def print_float_8_array(values: np.ndarray) -> np.ndarray:
+    """
+    Prints an array of floats in nastran 8-character width syntax,
+    the same as calling print_float_8 on each value.
+
+    Values in the fixed-point ranges of print_float_8 are printed with
+    vectorized integer arithmetic, the others (very small, very large
+    or non-finite values) with print_float_8.
+
+    Parameters
+    ----------
+    values : ndarray
+        the values to print
+
+    Returns
+    -------
+    fields : ndarray
+        the 8-character strings, with the same shape as values
+
+    """
+    values = np.asarray(values, dtype='float64')
+    flat = values.ravel()
+    fields = np.full(flat.shape, '        ', dtype='<U8')
+    todo = ~isnan(flat)
+
+    zero = flat == 0.0
+    fields[zero] = '      0.'
+    todo &= ~zero
+
+    for lower, upper, decimals in _FIXED_RANGES_8:
+        if lower > 0.:
+            in_range = (flat >= lower) & (flat < upper)
+        else:
+            in_range = (flat > lower) & (flat <= upper)
+        in_range &= todo
+        if not in_range.any():
+            continue
+        range_fields, ok = print_fixed_array(flat[in_range], decimals, 8)
+        in_range[in_range] = ok
+        fields[in_range] = range_fields[ok]
+        todo &= ~in_range
+
+    others = [print_float_8(value) for value in flat[todo].tolist()]
+    if others:
+        if max(len(field) for field in others) > 8:
+            fields = fields.astype(object)
+        fields[todo] = others
+
+    return fields.astype(str).reshape(values.shape)
+
+
 #def print_float_or_int_8(value: Union[int, float]) - str:
     #"""
     #Prints a 8-character width field
@@ -0,0 +1,119 @@
+"""The :mod:`~bulkdata.query` module provides the
+:class:`~bulkdata.query.Query` class, which compiles the filters
+used to query :class:`~bulkdata.deck.Deck` cards.
+"""
+
+from collections import Counter
+
+from .util import islist
+
+
+def iter_index_value(dict_):
+    """Iterate the ``(index, value)`` pairs of an *index*/*value* dict,
+    as used by the *fields* filter and by updates.
+    """
+    index = dict_["index"]
+    value = dict_["value"]
+    if islist(value):
+        if not islist(index):
+            raise TypeError("value is type {} but index is type {}"
+                            .format(type(value), type(index)))
+        for each_index, each_value in zip(index, value):
+            yield each_index, each_value
+    else:
+        yield index, value
+
+
+class Query:
+    """:class:`~bulkdata.query.Query` class compiles a filter into
+    a reusable predicate, which returns ``True`` for the cards
+    matching the filter. The filter is read once, when the query is
+    created, and matching stops at the first failed condition.
+
+    :type filter: dict, str
+    :param filter: The filter, see :meth:`~bulkdata.deck.Deck.find`,
+                   defaults to ``None``, which matches every card.
+
+    A :class:`~bulkdata.query.Query` may be passed wherever
+    :class:`~bulkdata.deck.Deck` accepts a filter, which avoids
+    compiling the filter again when querying in a loop:
+
+    .. code-block:: python
+
+        query = deck.compile({"name": "CQUAD4", "contains": [1, 1]})
+        for subdeck in decks:
+            cards = list(subdeck.find(query))
+    """
+
+    def __init__(self, filter=None):
+        if filter is None:
+            filter = {}
+        elif isinstance(filter, str):
+            filter = {"name": filter}
+
+        self.has_name = "name" in filter
+        self.name = filter.get("name")
+
+        filter_fields = filter.get("fields")
+        if filter_fields:
+            self.fields = list(iter_index_value(filter_fields))
+        else:
+            self.fields = []
+
+        filter_contains = filter.get("contains")
+        if not filter_contains:
+            filter_contains = []
+        elif not islist(filter_contains):
+            filter_contains = [filter_contains]
+        # multiset of values, each must be matched by a different field
+        self.contains = Counter(filter_contains)
+        self._numcontains = len(filter_contains)
+
+    def matches_name(self, card):
+        return not self.has_name or card.name == self.name
+
+    def matches_fields(self, card):
+        fields = card.fields
+        try:
+            for index, value in self.fields:
+                if fields[index].value != value:
+                    return False
+        except IndexError:
+            return False
+        return True
+
+    def matches_contains(self, card):
+        if not self._numcontains:
+            return True
+        remaining = dict(self.contains)
+        numremaining = self._numcontains
+        for field in card.fields:
+            value = field.value
+            if remaining.get(value):
+                remaining[value] -= 1
+                numremaining -= 1
+                if not numremaining:
+                    return True
+        return False
+
+    def __call__(self, card):
+        """Return ``True`` if *card* matches the query,
+        ``False`` otherwise.
+        """
+        return (self.matches_name(card)
+                and self.matches_fields(card)
+                and self.matches_contains(card))
+
+    def __bool__(self):
+        """Return ``False`` if the query matches every card,
+        ``True`` otherwise.
+        """
+        return self.has_name or bool(self.fields) or bool(self._numcontains)
+
+    def __repr__(self):
+        return "{}(name={!r}, fields={!r}, contains={!r})".format(
+            self.__class__.__name__, self.name, self.fields,
+            list(self.contains.elements()))
+
+
+__all__ = ["Query"]
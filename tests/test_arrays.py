@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+"""Tests for `bulkdata.arrays` module."""
+
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from bulkdata.arrays import raw_fields_array, column_array, cards_to_arrays
+from bulkdata.arrays import format_column, arrays_to_cards
+from bulkdata.arrays import read_fields_array, INTEGER, REAL, STRING
+from bulkdata.card import Card
+from bulkdata.field import read_field, write_field
+
+from .test_field import conformance_corpus
+
+
+@pytest.fixture
+def grids():
+    grids = []
+    for i in range(5):
+        card = Card("GRID")
+        card.extend([i + 1, None, 1.5 * i, "2.-1", i])
+        if i % 2:
+            card.append(1)
+        grids.append(card)
+    return grids
+
+
+def test_raw_fields_array(grids):
+
+    raw = raw_fields_array(grids)
+    assert raw.shape == (5, 6)
+    assert list(raw[0]) == ["1", "", "0.", "2.-1", "0", ""]
+    assert list(raw[1]) == ["2", "", "1.5", "2.-1", "1", "1"]
+
+    raw = raw_fields_array(grids, 2)
+    assert raw.shape == (5, 2)
+
+    raw = raw_fields_array([])
+    assert raw.shape == (0, 0)
+
+
+def test_read_fields_array():
+
+    raw = conformance_corpus()
+    ints, floats, strs, kinds = read_fields_array(raw)
+    for i, field in enumerate(raw):
+        value = read_field(field)
+        if isinstance(value, int):
+            assert kinds[i] == INTEGER and ints[i] == value, field
+        elif isinstance(value, float):
+            assert kinds[i] == REAL and floats[i] == value, field
+        else:
+            assert kinds[i] == STRING and strs[i] == value, field
+
+    raw = ["9223372036854775807", " -9223372036854775808 ",
+           "9999999999999999999", "-123456789012345678901"]
+    ints, floats, strs, kinds = read_fields_array(raw)
+    assert kinds.tolist() == [INTEGER, INTEGER, REAL, REAL]
+    assert ints[:2].tolist() == [read_field(field) for field in raw[:2]]
+    assert floats[2:].tolist() == [float(read_field(field))
+                                   for field in raw[2:]]
+
+    ints, floats, strs, kinds = read_fields_array([])
+    assert len(ints) == len(floats) == len(strs) == len(kinds) == 0
+
+
+def test_column_array():
+
+    column = column_array(np.array(["1", "", "-3"]))
+    assert column.dtype == np.int64
+    assert list(column) == [1, 0, -3]
+
+    column = column_array(np.array(["1", "", "1.-3", ".5"]))
+    assert column.dtype == np.float64
+    assert np.isnan(column[1])
+    assert list(column[[0, 2, 3]]) == [1., 1e-3, .5]
+
+    column = column_array(np.array(["1", "", "THRU"]))
+    assert column.dtype == object
+    assert list(column) == [1, "", "THRU"]
+
+    # few distinct values
+    column = column_array(np.array(["1", "", "THRU"] * 1000))
+    assert list(column) == [1, "", "THRU"] * 1000
+
+
+def test_cards_to_arrays(grids):
+
+    arrays = cards_to_arrays(grids, ["id", "cp", "x", None, "z", "cd"])
+    assert isinstance(arrays, OrderedDict)
+    assert list(arrays) == ["id", "cp", "x", "z", "cd"]
+    assert list(arrays["id"]) == [1, 2, 3, 4, 5]
+    assert list(arrays["cp"]) == [0] * 5
+    assert np.allclose(arrays["x"], [0., 1.5, 3., 4.5, 6.])
+    assert list(arrays["z"]) == [0, 1, 2, 3, 4]
+    assert list(arrays["cd"]) == [0, 1, 0, 1, 0]
+
+    arrays = cards_to_arrays(grids)
+    assert list(arrays) == list(range(6))
+    assert np.allclose(arrays[3], 0.2)
+
+
+def test_format_column():
+
+    columns = [
+        np.array([0, 1, -12, 12345678]),
+        np.array([0., 1.5, -1e-9, 123456789., np.nan, 1.5]),
+        np.array(["THRU", "helloworld", ""]),
+        [1, 2.5, None, "str"]
+    ]
+    for column in columns:
+        expect = [write_field(value) for value in column]
+        assert format_column(column) == expect
+
+    large = np.array([3.14159265358979, -1e-20, 7])
+    assert format_column(large, 2) == [write_field(value, 2)
+                                       for value in large]
+
+    assert format_column(np.array([True, False])) == [write_field(True),
+                                                      write_field(False)]
+    assert format_column(np.array([0, 255], dtype=np.uint8)) == ["0", "255"]
+
+    with pytest.raises(RuntimeError):
+        format_column(np.array([123456789]))
+    # unsigned integers above the int64 maximum do not wrap around
+    with pytest.raises(RuntimeError, match=str(2**64 - 1)):
+        format_column(np.array([2**64 - 1], dtype=np.uint64), 2)
+
+
+def test_arrays_to_cards(grids):
+
+    columns = OrderedDict([
+        ("id", np.arange(1, 4)),
+        ("cp", None),
+        ("x", np.array([1., 2., 3.])),
+        ("name", ["a", "b", "c"])
+    ])
+    cards = arrays_to_cards("GRID", columns)
+    assert [card.values() for card in cards] == [
+        [1, "", 1., "a"],
+        [2, "", 2., "b"],
+        [3, "", 3., "c"]
+    ]
+
+    cards = arrays_to_cards("GRID", [[1, 2], [1.2345678901234, 2.]],
+                            fieldspan=[1, 2])
+    assert len(cards[0]) == len(cards[1]) == 3
+    assert cards[0].get_large([1, 2]) == 1.2345678901234
+
+    arrays = cards_to_arrays(grids)
+    arrays2 = cards_to_arrays(arrays_to_cards("GRID", arrays))
+    for column, column2 in zip(arrays.values(), arrays2.values()):
+        assert np.array_equal(column, column2)
+
+    with pytest.raises(ValueError):
+        arrays_to_cards("GRID", [[1, 2], [1, 2, 3]])
+    # the order of a dict is not kept on all Python versions
+    with pytest.raises(TypeError):
+        arrays_to_cards("GRID", dict(columns))
@@ -0,0 +1,37 @@
+import pytest
+
+from bulkdata.binary import read_binary, read_binary_meta, write_binary
+from bulkdata.card import Card
+from bulkdata.error import BinaryFormatError
+
+
+def test_binary_roundtrip(tmp_path):
+
+    path = str(tmp_path / "cards.bin")
+    card1 = Card("GRID")
+    card1.extend([1, None, 1., 2., 3.])
+    card1.comment = "$ first grid"
+    card2 = Card("SET1")
+    card2.extend([10] + list(range(20)))
+    card3 = Card("PARAM")
+    write_binary(path, "SOL 101", [card1, card2, card3],
+                 meta={"key": [1, 2]})
+
+    header, cards, meta = read_binary(path)
+    assert header == "SOL 101"
+    assert [card.name for card in cards] == ["GRID", "SET1", "PARAM"]
+    assert [card.dumps() for card in cards] == [card1.dumps(), card2.dumps(),
+                                                card3.dumps()]
+    assert cards[0].comment == "$ first grid"
+    assert meta["user"] == {"key": [1, 2]}
+    assert read_binary_meta(path)["user"] == {"key": [1, 2]}
+
+
+def test_binary_bad_file(tmp_path):
+
+    path = tmp_path / "cards.bin"
+    path.write_bytes(b"GRID    1       0       1.      2.      3.\n")
+    with pytest.raises(BinaryFormatError):
+        read_binary(str(path))
+    with pytest.raises(BinaryFormatError):
+        read_binary_meta(str(path))
@@ -2,10 +2,14 @@
 
 """Tests for `bulkdata.card` module."""
 
+import pickle
+
 import pytest
 from collections.abc import Sequence
 
 from bulkdata.card import Card#, CardType
+from bulkdata.field import Field
+from bulkdata.format import format_card
 
 
 @pytest.fixture 
@@ -283,6 +287,40 @@ def test_card_get_large_number():
     assert got_number == 10000000
 
 
+def test_card_large_format_split_fields():
+
+    card = Card("GRID")
+    card.append(1)
+    card.append(0)
+    card.append(1.2345678901234, fieldspan=2)
+    assert card.dumps() == "GRID    1       0       1.2345678901234\n"
+    assert card.dumps("large") == "GRID*   1               0               " \
+                                  "1.2345678901234\n"
+    assert Card.loads(card.dumps("large")).values() == [1, 0, 1.2345678901234]
+
+    card = Card("GRID", size=4)
+    card[0] = 1
+    card[[1, 2]] = -12.3456789012345
+    card[3] = 3.
+    assert Card.loads(card.dumps("large")).values() == [1, -12.345678901234,
+                                                        3.]
+
+    # a replaced cell is not joined anymore
+    card[2] = 5
+    assert Card.loads(card.dumps("large")).values() == [1, -12.3456, 5, 3.]
+
+
+def test_card_large_format_long_name():
+
+    # no room for the large field mark, written in small fields
+    card = Card("BCTPARAM")
+    card.extend([1, 2])
+    assert card.dumps("large") == card.dumps()
+    loaded = Card.loads(card.dumps("large"))
+    assert loaded.name == "BCTPARAM"
+    assert loaded.values() == [1, 2]
+
+
 def test_card_freeformat(fields):
 
     numfields = 1 + 2 + len(fields["integers"]) + len(fields["reals"])
@@ -344,4 +382,107 @@ def test_card_dumps_trailing_blanks():
     card_str = """\
 MAT1    1       100000. .3      7800.
 """
-    assert card.dumps("fixed") == card_str
\ No newline at end of file
+    assert card.dumps("fixed") == card_str
+
+
+def test_card_comment():
+
+    card = Card("MAT1", comment="$ steel\n$ SI units")
+    card.extend([1, 200000., 0.3])
+
+    card_str = """\
+$ steel
+$ SI units
+MAT1    1       200000. .3
+"""
+    assert card.dumps() == card_str
+
+
+def test_card_pickle(card_str):
+
+    card = Card.loads(card_str)
+    assert not hasattr(card, "__dict__")
+
+    card2 = pickle.loads(pickle.dumps(card))
+    assert card2.name == card.name
+    assert card2.dumps() == card_str
+
+
+def test_card_from_raw():
+
+    raws = ["1", "", "1.5", "-2.", "hello"]
+    card = Card("GRID")
+    card.extend([1, None, 1.5, -2., "hello"])
+
+    raw_card = Card.from_raw("GRID", raws)
+    assert len(raw_card) == 5
+    for format in ("fixed", "free", "large"):
+        assert raw_card.dumps(format) == card.dumps(format)
+    assert raw_card.dumps(cache=True) is raw_card.dumps()
+    # the raw strings are only converted to fields once used
+    assert raw_card.values() == card.values()
+    raw_card.fields[0].value = 2
+    assert raw_card[0] == 2
+    assert raw_card.dumps() == card.dumps().replace("1 ", "2 ", 1)
+
+
+def test_card_dumps_cache():
+
+    card = Card("SET1")
+    card.extend(range(1, 12))
+
+    # the formatted string is only kept when asked for
+    fixed = card.dumps()
+    assert card.dumps() is not fixed
+    fixed = card.dumps(cache=True)
+    assert card.dumps() is fixed
+    assert card.dumps("free") == format_card(card, "free")
+    assert card.dumps() is fixed
+
+    def assert_dumps_changed(change):
+        before = card.dumps(cache=True)
+        change(card)
+        after = card.dumps(cache=True)
+        assert after != before
+        assert after == format_card(card)
+
+    def set_name(card):
+        card.name = "SET2"
+
+    def set_item(card):
+        card[0] = 99
+
+    def del_item(card):
+        del card[0]
+
+    def set_field_value(card):
+        card.fields[0].value = 98
+
+    def set_field_raw(card):
+        for field in card:
+            field.raw = "8"
+
+    def replace_field(card):
+        card.fields[1] = Field(97)
+
+    assert_dumps_changed(set_name)
+    assert_dumps_changed(set_item)
+    assert_dumps_changed(del_item)
+    assert_dumps_changed(set_field_value)
+    assert_dumps_changed(set_field_raw)
+    assert_dumps_changed(replace_field)
+    assert_dumps_changed(lambda card: card.fields.append(Field(96)))
+    assert_dumps_changed(lambda card: card.append(12))
+    assert_dumps_changed(lambda card: card.extend([13, 14]))
+    assert_dumps_changed(lambda card: card.pop())
+    assert_dumps_changed(lambda card: card.resize(5))
+    assert_dumps_changed(lambda card: card.set_raw_fields([Field("7")]))
+    card.strip()
+    assert card.dumps() == format_card(card)
+
+    # comments are not cached
+    card.comment = "$ set"
+    assert card.dumps() == "$ set\n" + format_card(card)
+
+    card.clear_dumps_cache()
+    assert card.dumps() == "$ set\n" + format_card(card)
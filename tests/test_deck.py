@@ -2,9 +2,15 @@
 
 """Tests for `bulkdata.deck` module."""
 
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import io
+import os
+
 import pytest
 
 # from bulkdata.format import FixedFormat, FreeFormat
+import bulkdata.deck
 from bulkdata.card import Card
 from bulkdata.deck import Deck
 
@@ -104,6 +110,16 @@ def test_deck_find_contains(cards):
     pass
 
 
+def test_deck_find_compiled(cards):
+
+    deck = Deck(cards)
+
+    query = deck.compile({"name": "TWO", "contains": ["this-1", 2]})
+    assert list(deck.find(query)) == [cards[1]]
+    assert deck.find_one(query) is cards[1]
+    assert deck.find_one(deck.compile("FIVE")) is None
+
+
 def test_deck_find_one():
 
     deck = Deck()
@@ -130,6 +146,131 @@ def test_deck_find_notexist():
     assert not cards
 
 
+def test_deck_name_index(cards):
+
+    deck = Deck(list(cards))
+    assert deck["TWO"] == [cards[1]]
+
+    deck.append(Card("TWO"))
+    deck.extend([Card("FIVE"), Card("TWO")])
+    assert [deck.cards.index(card) for card in deck["TWO"]] == [1, 4, 6]
+
+    deck[1] = Card("SIX")
+    deck[-1] = Card("SIX")
+    assert len(deck["TWO"]) == 1
+    assert len(deck["SIX"]) == 2
+    assert deck.find_one("SIX") is deck[1]
+
+    assert deck.delete("ONE") == 1
+    assert deck.find_one("SIX") is deck[0]
+    deck.replace("SIX", Card("SEVEN"))
+    assert not deck["SIX"]
+    assert len(deck["SEVEN"]) == 2
+    assert deck.find_one("FIVE") is deck[4]
+
+    deck[0].name = "EIGHT"
+    deck.reindex()
+    assert deck.find_one("EIGHT") is deck[0]
+
+    # cards added or removed through the cards lists
+    grids = [Card("GRID")]
+    deck = Deck(grids)
+    assert len(deck["GRID"]) == 1
+    grids.insert(0, Card("GRID"))
+    assert len(deck["GRID"]) == 2
+    deck.cards.append(Card("GRID"))
+    deck.append(Card("CORD"))
+    assert len(deck["GRID"]) == 3
+    assert deck.find_one("CORD") is deck[3]
+    deck.cards.pop(0)
+    assert deck.delete("GRID") == 2
+    deck.cards.insert(0, Card("GRID"))
+    assert deck.delete("CORD") == 1
+    assert deck["GRID"] == [deck[0]]
+
+
+def test_deck_field_index():
+
+    deck = Deck()
+    for i in range(10):
+        card = Card("GRID")
+        card.extend([i, None, float(i)])
+        deck.append(card)
+    deck.append(Card("CQUAD4"))
+    deck.create_index("GRID", 0)
+
+    def find_grid(gid):
+        return list(deck.find({"name": "GRID",
+                               "fields": {"index": 0, "value": gid}}))
+
+    assert find_grid(3) == [deck[3]]
+    assert find_grid(10) == []
+
+    card = Card("GRID")
+    card.extend([10, None, 10.])
+    deck.append(card)
+    assert find_grid(10) == [card]
+
+    deck.update({"name": "GRID", "fields": {"index": 0, "value": 3}},
+                {"index": 0, "value": 30})
+    assert find_grid(3) == []
+    assert find_grid(30) == [deck[3]]
+
+    deck.replace({"name": "GRID", "fields": {"index": 0, "value": 30}},
+                 Card("CBAR"))
+    assert find_grid(30) == []
+
+    assert deck.delete({"name": "GRID",
+                        "fields": {"index": [0, 2], "value": [5, 5.]}}) == 1
+    assert find_grid(5) == []
+    assert find_grid(6) == [deck[5]]
+
+    deck[0][0] = 100
+    deck.reindex()
+    assert find_grid(100) == [deck[0]]
+
+    deck.drop_index("GRID", 0)
+    assert find_grid(100) == [deck[0]]
+
+
+def test_deck_index_delete():
+
+    deck = Deck()
+    for i in range(12):
+        card = Card("GRID")
+        card.extend([i % 3, None, float(i)])
+        deck.append(card)
+    deck.create_index("GRID", 0)
+
+    def find_grids(value):
+        return [card[2] for card in deck.find(
+            {"name": "GRID", "fields": {"index": 0, "value": value}})]
+
+    assert find_grids(1) == [1., 4., 7., 10.]
+
+    # deletes keep the indexes, later cards are still found
+    deck.delete({"name": "GRID", "fields": {"index": 0, "value": 2}})
+    assert deck._field_indexes[("GRID", 0)] is not None
+    assert find_grids(1) == [1., 4., 7., 10.]
+    assert [card[2] for card in deck.find("GRID")] == [0., 1., 3., 4., 6.,
+                                                       7., 9., 10.]
+    card = Card("GRID")
+    card.extend([1, None, 12.])
+    deck.append(card)
+    assert find_grids(1) == [1., 4., 7., 10., 12.]
+    assert deck.find_one({"name": "GRID",
+                          "fields": {"index": 2, "value": 12.}}) is card
+
+    # a card changed in place does not unindex another card
+    deck[2][0] = 1
+    deck[2] = Card("CBAR")
+    assert find_grids(1) == [1., 4., 7., 10., 12.]
+    deck[0].name = "GRID2"
+    deck[0] = Card("CBAR")
+    assert find_grids(0) == [6., 9.]
+    assert len(deck["CBAR"]) == 2
+
+
 def test_deck_replace(cards):
 
     deck = Deck(cards)
@@ -216,6 +357,322 @@ def test_deck_load_bdf_pyNastran():
         assert deck.dumps("free") == f.read()
 
 
+def test_deck_load_large():
+
+    deck_str = """\
+GRID*                  1               0 1.2345678901234           -12.5*G1
+*G1                  3.5
+GRID           2       0      1.      2.      3.
+"""
+    deck = Deck.loads(deck_str)
+    assert [card.name for card in deck.cards] == ["GRID", "GRID"]
+    grid = deck.find_one({"name": "GRID", "fields": {"index": 0, "value": 1}})
+    assert grid[2] == 1.2345678901234
+    assert grid.dumps() == "GRID    1       0       1.234568-12.5   3.5\n"
+
+    # setting a large field keeps its width
+    grid[3] = -12.3456789012345
+    assert grid.dumps("large") == (
+        "GRID*   1               0               1.2345678901234 "
+        "-12.345678901234*0      \n"
+        "*0      3.5\n")
+    deck_large = Deck.loads(deck.dumps("large"))
+    assert deck_large.dumps("large") == deck.dumps("large")
+    assert deck_large.dumps() == deck.dumps()
+
+
+def test_deck_load_include(tmp_path):
+
+    (tmp_path / "mat.inc").write_text("MAT1    1       200000.         .3\n")
+    bdf_path = tmp_path / "model.bdf"
+    bdf_path.write_text("""\
+BEGIN BULK
+INCLUDE 'mat.inc'
+GRID    1       0       1.      2.      3.
+ENDDATA""")
+
+    with open(str(bdf_path)) as bdf_file:
+        deck = Deck.load(bdf_file, resolve_includes=True)
+    assert [card.name for card in deck.cards] == ["MAT1", "GRID"]
+    assert deck.find_one("MAT1")[1] == 200000.
+
+    # each load gets its own cards
+    deck.find_one("MAT1")[1] = 70000.
+    deck2 = Deck.loads(bdf_path.read_text(), include_dir=str(tmp_path))
+    assert deck2.find_one("MAT1")[1] == 200000.
+
+
+def test_deck_load_many():
+
+    paths = [BDF_DIR + "/testA.bdf", BDF_DIR + "/zaero-example.bdf"] * 2
+    expect = []
+    for path in paths:
+        with open(path) as bdf_file:
+            expect.append(Deck.load(bdf_file, keep_comments=True).dumps())
+
+    for executor in ("process", "thread"):
+        decks = Deck.load_many(paths, workers=2, executor=executor,
+                               keep_comments=True)
+        assert [deck.dumps() for deck in decks] == expect
+
+    loaded = dict(Deck.load_many_as_completed(paths[:2], workers=2,
+                                              keep_comments=True))
+    assert sorted(loaded) == sorted(paths[:2])
+    assert loaded[paths[0]].dumps() == decks[0].dumps()
+
+    with pytest.raises(ValueError):
+        Deck.load_many(paths, executor="fiber")
+
+
+def test_deck_aload_adump():
+
+    async def tick(ticks, done):
+        while not done.is_set():
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def load_and_dump(executor):
+        ticks = []
+        done = asyncio.Event()
+        ticker = asyncio.ensure_future(tick(ticks, done))
+        with open(BDF_DIR + "/testA.bdf") as bdf_file:
+            deck = await Deck.aload(bdf_file, keep_comments=True,
+                                    batch_size=10, executor=executor)
+        fp = io.StringIO()
+        numchars = await deck.adump(fp, batch_size=10, executor=executor)
+        done.set()
+        await ticker
+        return deck, fp.getvalue(), numchars, len(ticks)
+
+    with open(BDF_DIR + "/testA.bdf") as bdf_file:
+        expect = Deck.load(bdf_file, keep_comments=True).dumps()
+
+    with ProcessPoolExecutor(1) as process_executor:
+        for executor in (None, process_executor):
+            loop = asyncio.new_event_loop()
+            try:
+                deck, deck_str, numchars, numticks = loop.run_until_complete(
+                    load_and_dump(executor))
+            finally:
+                loop.close()
+            assert deck.dumps() == expect
+            assert deck_str == expect
+            assert numchars == len(expect)
+            # the event loop ran between batches
+            assert numticks > 1
+
+
+def test_deck_dump():
+
+    with open(BDF_DIR + "/testA.bdf") as bdf_file:
+        deck = Deck.load(bdf_file)
+
+    for format in ("fixed", "free"):
+        expect = deck.dumps(format)
+        for buffer_size in (1, 100, 2**20):
+            fp = io.StringIO()
+            numchars = deck.dump(fp, format, buffer_size=buffer_size)
+            assert numchars == len(expect)
+            assert fp.getvalue() == expect
+
+    # the cards only keep their formatted strings when asked to
+    assert all(card._dumps_cache is None for card in deck)
+    expect = deck.dumps(cache=True)
+    assert all(card._dumps_cache is not None for card in deck)
+    assert deck.dumps(cache=True) == expect
+    deck.cards[0].fields[0].value = 123456
+    assert deck.dumps(cache=True) == deck.dumps() != expect
+    assert "123456" in deck.dumps(cache=True)
+
+
+def test_deck_dump_workers(monkeypatch):
+
+    with open(BDF_DIR + "/testA.bdf") as bdf_file:
+        deck = Deck.load(bdf_file)
+
+    # several slices per worker
+    monkeypatch.setattr(bulkdata.deck, "_DUMP_CHUNK_SIZE", 7)
+    for format in ("fixed", "free"):
+        expect = deck.dumps(format)
+        assert deck.dumps(format, workers=2) == expect
+        fp = io.StringIO()
+        assert deck.dump(fp, format, workers=2) == len(expect)
+        assert fp.getvalue() == expect
+
+    # decks dumped at the same time from several threads keep their
+    # own cards
+    deck2 = Deck(deck.cards[::-1], deck.header)
+    with ThreadPoolExecutor(2) as executor:
+        futures = [executor.submit(each_deck.dumps, workers=2)
+                   for each_deck in (deck, deck2) * 2]
+        assert [future.result() for future in futures] == [
+            deck.dumps(), deck2.dumps()] * 2
+    assert bulkdata.deck._dump_cards is None
+
+    # slices are pickled over to workers that are not forked
+    monkeypatch.setattr(bulkdata.deck.multiprocessing, "get_start_method",
+                        lambda: "spawn")
+    assert deck.dumps(workers=2) == deck.dumps()
+
+
+def test_deck_iterload():
+
+    bdf_filename = BDF_DIR + "/testA.bdf"
+
+    with open(bdf_filename) as bdf_file:
+        deck = Deck.load(bdf_file)
+
+    with open(bdf_filename) as bdf_file:
+        cards = list(Deck.iterload(bdf_file))
+
+    assert len(cards) == len(deck)
+    assert Deck(cards).dumps() == Deck(deck.cards).dumps()
+
+
+def test_deck_load_mmap():
+
+    bdf_filename = BDF_DIR + "/testA.bdf"
+
+    with open(bdf_filename) as bdf_file:
+        deck = Deck.load(bdf_file)
+
+    deck_mmap = Deck.load_mmap(bdf_filename)
+
+    assert deck_mmap.header == deck.header
+    assert deck_mmap.dumps() == deck.dumps()
+
+
+def test_deck_load_mmap_empty(tmp_path):
+
+    bdf_path = tmp_path / "empty.bdf"
+    bdf_path.write_text("")
+
+    deck = Deck.load_mmap(str(bdf_path))
+    assert not deck
+    assert not deck.header
+
+
+def test_deck_binary(tmp_path):
+
+    with open(BDF_DIR + "/testA.bdf") as bdf_file:
+        deck = Deck.load(bdf_file, keep_comments=True)
+    binary_path = str(tmp_path / "testA.bin")
+    deck.save_binary(binary_path)
+
+    deck_binary = Deck.load_binary(binary_path)
+    assert deck_binary.header == deck.header
+    assert deck_binary.dumps() == deck.dumps()
+    assert deck_binary.dumps("free") == deck.dumps("free")
+
+    # large fields keep their span
+    deck = Deck.loads("GRID*                  1               0 "
+                      "1.2345678901234           -12.5\n")
+    deck.save_binary(binary_path)
+    assert Deck.load_binary(binary_path).dumps("large") == deck.dumps("large")
+
+    # values split in cells are still written as large fields
+    card = Card("GRID")
+    card.extend([1, 0])
+    card.append(1.2345678901234, fieldspan=2)
+    deck = Deck([card])
+    deck.save_binary(binary_path)
+    assert Deck.load_binary(binary_path).dumps("large") == deck.dumps("large")
+
+
+def test_deck_load_cache(tmp_path, monkeypatch):
+
+    bdf_path = tmp_path / "model.bdf"
+    bdf_path.write_text("""\
+BEGIN BULK
+GRID    1       0       1.      2.      3.
+ENDDATA""")
+    cache_path = tmp_path / "model.bdf.bdcache"
+
+    def load(**kwargs):
+        with open(str(bdf_path)) as bdf_file:
+            return Deck.load(bdf_file, cache=True, **kwargs)
+
+    assert load().dumps() == Deck.loads(bdf_path.read_text()).dumps()
+    assert cache_path.exists()
+
+    # the side-car cache is used while the file is unchanged
+    loads = []
+    monkeypatch.setattr(Deck, "loads", classmethod(
+        lambda cls, *args, **kwargs: loads.append(args)))
+    assert load().find_one("GRID")[2] == 1.
+    assert not loads
+    monkeypatch.undo()
+
+    # and refreshed when the file changes
+    bdf_path.write_text(bdf_path.read_text().replace("1.      2.",
+                                                     "4.      2."))
+    assert load().find_one("GRID")[2] == 4.
+    assert load().find_one("GRID")[2] == 4.
+
+    # even if its size and mtime do not
+    stat = os.stat(str(bdf_path))
+    bdf_path.write_text(bdf_path.read_text().replace("4.      2.",
+                                                     "5.      2."))
+    os.utime(str(bdf_path), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load().find_one("GRID")[2] == 5.
+
+    # or when the options change
+    bdf_path.write_text("$ grid\n" + bdf_path.read_text())
+    assert load(keep_comments=True).dumps().startswith("$ grid")
+    assert "$" not in load().dumps()
+
+
+def test_deck_load_keep_comments():
+
+    deck_str = """\
+$ header comment
+SOL 144
+BEGIN BULK
+$ grid points
+GRID    1               0.      0.      0.
+GRID    2               1.      0.      0.
+$ material
+MAT1    1       100000. .3      7800.
+ENDDATA"""
+
+    deck = Deck.loads(deck_str, keep_comments=True)
+    assert deck.dumps() == deck_str
+
+    deck = Deck.loads(deck_str)
+    assert "$" not in deck.dumps()
+
+    cards = list(Deck.iterload(io.StringIO(deck_str), keep_comments=True))
+    assert [card.comment for card in cards] == ["$ grid points", "",
+                                                "$ material"]
+
+
+def test_deck_load_trailing_comment(tmp_path):
+
+    deck_str = """\
+SOL 144
+BEGIN BULK
+GRID    1               0.      0.      0.
+$ tail
+$ more tail
+ENDDATA"""
+
+    deck = Deck.loads(deck_str, keep_comments=True)
+    assert deck.trailing_comment == "$ tail\n$ more tail"
+    assert deck.dumps() == deck_str
+    assert Deck.loads(deck_str, keep_comments=True, workers=2).dumps() == \
+        deck_str
+    assert deck.sorted().dumps() == deck_str
+    assert Deck.loads(deck_str).dumps() == deck_str.replace(
+        "$ tail\n$ more tail\n", "")
+
+    bdf_path = tmp_path / "model.bdf"
+    bdf_path.write_text(deck_str)
+    deck = Deck.load_mmap(str(bdf_path), keep_comments=True)
+    assert deck.dumps() == deck_str
+    deck.save_binary(str(tmp_path / "model.bin"))
+    assert Deck.load_binary(str(tmp_path / "model.bin")).dumps() == deck_str
+
+
 def test_deck_sort_by_name(cards):
 
     deck = Deck(cards)
@@ -325,9 +782,45 @@ def test_zaero_example():
     # assert False
 
 
-    
+def test_deck_to_arrays():
 
+    bdf_filename = BDF_DIR + "/testA.bdf"
 
+    with open(bdf_filename) as bdf_file:
+        deck = Deck.load(bdf_file)
 
+    grids = deck["GRID"]
+    arrays = deck.to_arrays("GRID", ["id", "cp", "x", "y", "z"])
 
-    
\ No newline at end of file
+    assert len(arrays["id"]) == len(grids)
+    for i, grid in enumerate(grids):
+        assert arrays["id"][i] == grid[0]
+        if len(grid) > 2 and grid[2] != "":
+            assert arrays["x"][i] == grid[2]
+
+
+def test_deck_from_arrays():
+
+    ids = list(range(1, 11))
+    xyz = [[0.1 * i, -2.5 * i, 1e-9 * i] for i in ids]
+
+    deck = Deck()
+    for gid, (x, y, z) in zip(ids, xyz):
+        grid = Card("GRID")
+        grid.extend([gid, None, x, y, z])
+        deck.append(grid)
+
+    columns = [ids, None] + [list(column) for column in zip(*xyz)]
+    deck_arrays = Deck.from_arrays("GRID", columns)
+
+    assert deck_arrays.dumps() == deck.dumps()
+    assert len(deck_arrays["GRID"]) == len(ids)
+
+    # high precision values are written as single large fields
+    x = [1.2345678901234 * i for i in ids]
+    deck_large = Deck.from_arrays("GRID", [ids, None, x],
+                                  fieldspan=[1, 1, 2])
+    cards = Deck.loads(deck_large.dumps("large")).cards
+    assert [card.values() for card in cards] == [
+        [gid, "", pytest.approx(value, rel=1e-12)]
+        for gid, value in zip(ids, x)]
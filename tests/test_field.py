@@ -2,13 +2,18 @@
 
 """Tests for `bulkdata.field` module."""
 
+import itertools
+
+import numpy as np
 import pytest
 
 from bulkdata.field import Field, LargeField
-from bulkdata.field import _force_E
+from bulkdata.field import _force_E, _is_match, rx_INT, rx_REAL
 from bulkdata.field import is_integer_field, is_real_field
 from bulkdata.field import read_integer_field, read_real_field, read_field
 from bulkdata.field import write_field
+from bulkdata.field import set_write_field_cache_size
+from bulkdata.field import write_field_cache_clear, write_field_cache_info
 
 
 @pytest.fixture
@@ -119,6 +124,45 @@ def test_read_field_real():
         assert field == expect
 
 
+def conformance_corpus():
+    """Field strings covering Nastran numbers, near misses and every
+    string of up to 4 characters over a small alphabet.
+    """
+    corpus = [
+        "7", "-7", "+7", "0", "-0", "007", "1.", "-1.", ".5", "-.5",
+        "1.5", "1.-3", "-1.5-3", ".5+2", "1.5E3", "1.5e-3", "1.E5",
+        "1e5", "1+5", "1.5E+03", "12345678", "1.234567+5", "  -1.5 ",
+        "\t3\n", "", " ", ".", "+", "-.", "E5", "1.5E", "1.5e+",
+        "1.5+-3", "1.2.3", "1..2", "1e5.5", "inf", "nan", "1_000",
+        "0x10", "GRID", "+0", "1E5E5", "\u0663", "1\u0663",
+        "\u0663.5-\u0663", "\u00b2", "1\u00b2", "\uff11",
+    ]
+    alphabet = "01+-.eE \u0663a"
+    for length in range(5):
+        corpus.extend("".join(chars) for chars in
+                      itertools.product(alphabet, repeat=length))
+    return corpus
+
+
+def test_field_conformance():
+
+    for field in conformance_corpus():
+        is_integer = _is_match(rx_INT, field)
+        is_real = _is_match(rx_REAL, field)
+        assert is_integer_field(field) == is_integer, field
+        assert is_real_field(field) == is_real, field
+
+        value = read_field(field)
+        stripped = field.strip()
+        if is_integer:
+            assert value == int(stripped) and isinstance(value, int)
+        elif is_real:
+            assert value == float(_force_E(stripped))
+            assert isinstance(value, float)
+        else:
+            assert value == stripped
+
+
 def test_write_integer_field():
 
     test_tuples = [
@@ -222,4 +266,56 @@ def test_blank_field():
 
     field = Field("        ")
     assert field.is_blank()
-    assert not field
\ No newline at end of file
+    assert not field
+
+
+def test_field_value_cache():
+
+    field = Field("1.5+3")
+    assert field.value == 1500.
+
+    field.raw = "7"
+    assert field.value == 7
+
+    field.value = "hello"
+    assert field.value == "hello"
+    assert field.raw == "hello"
+
+    field.value = 2.5
+    assert field.value == 2.5
+    assert field.raw == "2.5"
+
+
+def test_field_slots():
+
+    for field in (Field(1.5), LargeField(1.5)):
+        assert not hasattr(field, "__dict__")
+        with pytest.raises(AttributeError):
+            field.other = None
+
+
+def test_write_field_cache():
+
+    write_field_cache_clear()
+    assert write_field(1.5) == "1.5"
+    assert write_field(1.5) == "1.5"
+    assert write_field(1.5, 2) == "1.5"
+    info = write_field_cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+    # cached by type
+    assert write_field(1) == "1"
+    assert write_field(1.) == "1."
+    assert write_field(True) == write_field(True)
+
+    # strings and unhashable values are not cached
+    assert write_field("hello") == "hello"
+    assert write_field(np.array(2.5)) == "2.5"
+    assert write_field_cache_info().currsize == 5
+
+    set_write_field_cache_size(0)
+    try:
+        assert write_field(1.5) == write_field(1.5) == "1.5"
+        assert write_field_cache_info().hits == 0
+    finally:
+        set_write_field_cache_size(65536)
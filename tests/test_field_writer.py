@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""Tests for `bulkdata.pyNastran.bdf` field writer modules."""
+
+import numpy as np
+
+from bulkdata.pyNastran.bdf.field_writer_8 import print_float_8
+from bulkdata.pyNastran.bdf.field_writer_8 import print_float_8_array
+from bulkdata.pyNastran.bdf.field_writer_16 import print_float_16
+from bulkdata.pyNastran.bdf.field_writer_16 import print_float_16_array
+
+
+def random_floats(seed=0, size=20000):
+    """Random floats over every branch of the scalar float writers,
+    plus the values at and next to their branch boundaries.
+    """
+    rng = np.random.default_rng(seed)
+    sign = rng.choice([-1., 1.], size)
+    # spread over many orders of magnitude
+    spread = sign * 10. ** rng.uniform(-20., 20., size)
+    # few significant digits, like typical model data
+    magnitude = 10. ** rng.uniform(-4., 8., size)
+    rounded = sign * np.round(magnitude * 1000.) / 1000.
+    boundaries = []
+    for boundary in (5e-16, 5e-15, 5e-8, 5e-7, 1e-3, 1e-2, 1e-1, 0.5) + tuple(
+            10. ** np.arange(0, 16)) + (999999.5, 99999.95, 9999.995):
+        for value in (boundary, -boundary):
+            boundaries.extend([value, np.nextafter(value, 0.),
+                               np.nextafter(value, 2 * value)])
+    special = [0., -0., np.nan, 0.99999999, -0.99999999, 9.99999999,
+               1.25, 100000.25, 0.0625]
+    return np.concatenate([spread, rounded, boundaries, special])
+
+
+def test_print_float_8_array():
+
+    values = random_floats()
+    fields = print_float_8_array(values)
+    assert fields.shape == values.shape
+    assert fields.tolist() == [print_float_8(value) for value in values]
+
+
+def test_print_float_8_array_shape():
+
+    assert print_float_8_array(np.array([])).shape == (0,)
+
+    values = random_floats(seed=1, size=10)[:10].reshape(2, 5)
+    fields = print_float_8_array(values)
+    assert fields.shape == values.shape
+    assert fields[1, 0] == print_float_8(values[1, 0])
+
+
+def test_print_float_16_array():
+
+    values = random_floats()
+    fields = print_float_16_array(values)
+    assert fields.shape == values.shape
+    assert fields.tolist() == [print_float_16(value) for value in values]
@@ -4,7 +4,8 @@
 
 import pytest
 
-from bulkdata.format import FixedFormatter, FreeFormatter
+from bulkdata.field import Field
+from bulkdata.format import FixedFormatter, FreeFormatter, LargeFormatter
 
 from .util import MockCard
 
@@ -81,4 +82,41 @@ def test_write_trailing_blanks(fixedform):
 
     actual = fixedform.format_card(card)
     expect = "BLANKS\n"
-    assert actual == expect
\ No newline at end of file
+    assert actual == expect
+
+
+def test_format_card_large():
+
+    name = "TEST"
+    fields_str = "yes these fields are not properly formatted this is a test"
+    fields = fields_str.split()
+    card = MockCard(name, fields)
+    actual = LargeFormatter().format_card(card)
+    expect = (
+        "TEST*   yes             these           fields          are"
+        "             *0      \n"
+        "*0      not             properly        formatte        this"
+        "            *1      \n"
+        "*1      is              a               test\n")
+    assert actual == expect
+
+
+def test_format_card_large_long_name(fixedform):
+
+    # 8 character names leave no room for the large field mark,
+    # so these cards are written in small fields
+    card = MockCard("BCTPARAM", ["1", "2"])
+    actual = LargeFormatter().format_card(card)
+    assert actual == fixedform.format_card(card)
+    assert actual == "BCTPARAM1       2\n"
+
+
+def test_format_large_field(fixedform, freeform):
+
+    field = Field("1.2345678901234", 2)
+    assert fixedform.format_field(field) == "1.234568"
+    assert freeform.format_field(field) == "1.234568"
+    assert LargeFormatter().format_field(field) == "1.2345678901234 "
+
+    field = Field("helloworld", 2)
+    assert fixedform.format_field(field) == "hellowor"
@@ -2,9 +2,13 @@
 
 """Tests for `bulkdata.parse` module."""
 
+import io
+
 import pytest
 
-from bulkdata.parse import BDFParser
+from bulkdata.error import IncludeError
+from bulkdata.parse import (BDFParser, clear_include_cache,
+                            set_include_cache_size)
 
 from . import BDF_DIR, EXPECT_DIR
 
@@ -49,6 +53,39 @@ SPARSE  test1
     assert len(fields) == 17
 
 
+def test_parse_card_large():
+
+    card_str = """\
+GRID*                  1               0 1.2345678901234  -12.5000000000*G1
+*G1                  3.5
+"""
+
+    name, fields = BDFParser(card_str).parse_card()
+    assert name == "GRID*"
+    assert [field.strip() for field in fields] == [
+        "1", "0", "1.2345678901234", "-12.5000000000", "3.5"]
+
+    card_str = "GRID*,1,0,1.2345678901234,-12.5,+\n*,3.5"
+    name, fields = BDFParser(card_str).parse_card()
+    assert name == "GRID*"
+    assert fields == ["1", "0", "1.2345678901234", "-12.5", "3.5"]
+
+
+def test_parse_deck_large():
+
+    deck_str = """\
+GRID           1       0      1.      2.      3.
+GRID*                  2               0             1.0             2.0
+*                    3.0
+SET1           1       1       2
+*              3
+"""
+
+    header, cards = BDFParser(deck_str).parse()
+    assert [(name, len(fields)) for name, fields in cards] == [
+        ("GRID", 5), ("GRID*", 5), ("SET1*", 9)]
+
+
 def test_parse_deck_cards_only():
 
     deck_str = """\
@@ -146,3 +183,185 @@ def test_parse_bdf_pyNastran():
 
     assert header == expect_header
     assert len(card_tuples) == 143
+
+
+def test_parse_iter_file_bdf_pyNastran():
+
+    bdf_filename = BDF_DIR + "/testA.bdf"
+
+    with open(bdf_filename) as bdf_file:
+        header, card_tuples = BDFParser(bdf_file.read()).parse()
+
+    parser = BDFParser()
+    with open(bdf_filename) as bdf_file:
+        iter_tuples = list(parser.iter_file(bdf_file))
+
+    assert parser.header == header
+    assert iter_tuples == card_tuples
+
+
+def test_parse_iter_file_cards_only():
+
+    deck_str = """\
+HELLO   99      helloworld      0       3.3     1       6.6     2       +0
++0      9.9
+$
+HELLO,99,hellowor,ld,0,3.3,1,6.6,2,
+,9.9
+ENDDATA
+IGNORE THIS
+"""
+
+    parser = BDFParser()
+    card_tuples = list(parser.iter_file(io.StringIO(deck_str)))
+
+    assert not parser.header
+    assert card_tuples == BDFParser(deck_str).parse()[1]
+    assert len(card_tuples) == 2
+
+
+def test_parse_split_chunks():
+
+    lines = """\
+HELLO   99      helloworld      0       3.3     1       6.6     2       +0
++0      9.9
+HELLO   99      helloworld      0       3.3     1       6.6     2       +0
+HELLO   9.9
+HELLO,99,hellowor,ld,0,3.3,1,6.6,2,
+,9.9
+HELLO   99
+""".splitlines()
+
+    parser = BDFParser()
+    for numchunks in range(1, len(lines) + 1):
+        chunks = parser.split_chunks(lines, numchunks)
+        assert sum(chunks, []) == lines
+        for chunk in chunks:
+            assert chunk[0].startswith("HELLO")
+
+    chunks = parser.split_chunks(lines, len(lines))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 1]
+
+
+def test_parse_bdf_pyNastran_workers():
+
+    bdf_filename = BDF_DIR + "/testA.bdf"
+
+    with open(bdf_filename) as bdf_file:
+        bdf_str = bdf_file.read()
+
+    header, card_tuples = BDFParser(bdf_str).parse()
+    header_workers, card_tuples_workers = BDFParser(bdf_str).parse(workers=3)
+
+    assert header_workers == header
+    assert card_tuples_workers == card_tuples
+
+
+def test_parse_keep_comments():
+
+    deck_str = """\
+$ header comment
+SOL 144
+BEGIN BULK
+$ first
+$ card
+HELLO   99      helloworld      0       3.3     1       6.6     2       +0
+$ inside the card
++0      9.9
+HELLO   99
+$ trailing
+"""
+
+    parser = BDFParser(deck_str, keep_comments=True)
+    header, card_tuples = parser.parse()
+
+    assert header == "$ header comment\nSOL 144"
+    assert len(card_tuples) == 2
+    assert len(card_tuples[0][1]) == 9
+    assert parser.comments == {0: "$ first\n$ card", 1: "$ inside the card"}
+    assert parser.trailing_comment == "$ trailing"
+
+    parser_workers = BDFParser(deck_str, keep_comments=True)
+    assert parser_workers.parse(workers=2) == (header, card_tuples)
+    assert parser_workers.comments == parser.comments
+
+    parser_iter = BDFParser(keep_comments=True)
+    assert list(parser_iter.iter_file(io.StringIO(deck_str))) == card_tuples
+    assert parser_iter.header == header
+    assert parser_iter.comments == parser.comments
+
+
+def test_parse_include(tmp_path):
+
+    clear_include_cache()
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "lib" / "mat.inc").write_text("""\
+$ steel
+MAT1    1       200000.         .3
+INCLUDE 'coords.inc'
+""")
+    (tmp_path / "lib" / "coords.inc").write_text("""\
+CORD2R  1       0       0.      0.      0.      0.      0.      1.
+        1.      0.      0.
+""")
+    deck_str = """\
+SOL 101
+INCLUDE 'header.inc'
+BEGIN BULK
+GRID    1       0       1.      2.      3.
+INCLUDE 'lib/
+         mat.inc'
+GRID    2       0       1.      2.      3.
+"""
+
+    parser = BDFParser(deck_str, include_dir=str(tmp_path))
+    header, card_tuples = parser.parse()
+    assert "INCLUDE 'header.inc'" in header
+    assert [name for name, fields in card_tuples] == [
+        "GRID", "MAT1", "CORD2R", "GRID"]
+    assert len(card_tuples[2][1]) == 11
+
+    parser = BDFParser(deck_str, keep_comments=True, include_dir=str(tmp_path))
+    assert parser.parse(workers=2) == (header, card_tuples)
+    assert parser.comments == {1: "$ steel"}
+
+    # included files are only parsed again once modified
+    include = parser.parse_include_file("lib/mat.inc")
+    assert parser.parse_include_file("lib/mat.inc") is include
+    (tmp_path / "lib" / "coords.inc").write_text("")
+    assert parser.parse_include_file("lib/mat.inc") is not include
+    parser = BDFParser(deck_str, include_dir=str(tmp_path))
+    header, card_tuples = parser.parse()
+    assert [name for name, fields in card_tuples] == ["GRID", "MAT1", "GRID"]
+
+    # parsed cards do not share the cached fields
+    card_tuples[1][1][0] = "999"
+    parser = BDFParser(deck_str, include_dir=str(tmp_path))
+    header, card_tuples = parser.parse()
+    assert card_tuples[1][1][0].strip() == "1"
+
+    # the cache keeps the most recently used files, up to a number of cards
+    (tmp_path / "lib" / "coords.inc").write_text("""\
+CORD2R  1       0       0.      0.      0.      0.      0.      1.
+""")
+    set_include_cache_size(2)
+    try:
+        include = parser.parse_include_file("lib/coords.inc")
+        assert parser.parse_include_file("lib/coords.inc") is include
+        parser.parse_include_file("lib/mat.inc")
+        assert parser.parse_include_file("lib/coords.inc") is not include
+        set_include_cache_size(0)
+        include = parser.parse_include_file("lib/coords.inc")
+        assert parser.parse_include_file("lib/coords.inc") is not include
+    finally:
+        set_include_cache_size(1000000)
+
+    # INCLUDE statements are left alone unless include_dir is set
+    header, card_tuples = BDFParser(deck_str).parse()
+    assert card_tuples[1][0] == "INCLUDE"
+
+    (tmp_path / "lib" / "coords.inc").write_text("INCLUDE 'mat.inc'\n")
+    with pytest.raises(IncludeError):
+        BDFParser(deck_str, include_dir=str(tmp_path)).parse()
+    with pytest.raises(IncludeError):
+        BDFParser("INCLUDE 'lib/mat.inc", include_dir=str(tmp_path)).parse()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+"""Tests for `bulkdata.query` module."""
+
+import pytest
+
+from bulkdata.card import Card
+from bulkdata.query import Query
+
+
+@pytest.fixture
+def card():
+    card = Card("ASET1")
+    card.extend([3, 1, "THRU", 8, 1])
+    return card
+
+
+def test_query_empty(card):
+
+    for filter_ in (None, {}):
+        query = Query(filter_)
+        assert not query
+        assert query(card)
+
+
+def test_query_name(card):
+
+    assert Query("ASET1")(card)
+    assert Query({"name": "ASET1"})(card)
+    assert not Query({"name": "SPC1"})(card)
+
+
+def test_query_fields(card):
+
+    assert Query({"fields": {"index": 0, "value": 3}})(card)
+    assert Query({"fields": {"index": [0, 2], "value": [3, "THRU"]}})(card)
+    assert not Query({"fields": {"index": [0, 2], "value": [3, 1]}})(card)
+    assert not Query({"fields": {"index": 10, "value": 3}})(card)
+
+    with pytest.raises(TypeError):
+        Query({"fields": {"index": 0, "value": [3, 1]}})
+
+
+def test_query_contains(card):
+
+    assert Query({"contains": "THRU"})(card)
+    assert Query({"contains": [1, "THRU"]})(card)
+    # each value must be matched by a different field
+    assert Query({"contains": [1, 1]})(card)
+    assert not Query({"contains": [1, 1, 1]})(card)
+    assert not Query({"contains": [8, 9]})(card)
+
+
+def test_query_all(card):
+
+    query = Query({
+        "name": "ASET1",
+        "fields": {"index": 0, "value": 3},
+        "contains": [1, "THRU"]
+    })
+    assert query
+    assert query(card)
+
+    card[0] = 4
+    assert not query(card)